@@ -0,0 +1,97 @@
+# benchmarks/bench_cleaning.py
+#
+# Membandingkan throughput pembersihan teks: clean_text lama (7 pass re.sub
+# per baris + Sastrawi) lewat Series.apply vs clean_series (regex terkompilasi,
+# kata berhuruf saja dilewati, stopword frozenset) pada korpus komentar.
+#
+# Usage:
+#   python -m benchmarks.bench_cleaning                       # korpus sintetis 100k komentar
+#   python -m benchmarks.bench_cleaning --csv data/raw/x.csv  # korpus nyata (kolom full_text)
+
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
+from src.preprocessing.cleaner import clean_series, clean_text
+
+stopword_remover = StopWordRemoverFactory().create_stop_word_remover()
+
+_WORDS = (
+    "timnas indonesia garuda menang kalah yang dan di ke dari ini itu sudah belum tidak "
+    "ayo semangat pemain pelatih wasit gol bola piala dunia kualifikasi lolos bangga "
+    "sekali banget mantap keren jelek parah strategi serangan bertahan penalti kartu"
+).split()
+_EXTRAS = ["@pssi", "#GarudaDiDada", "https://youtu.be/abc123", "www.detik.com/x", "2026", "3-1",
+           "!!!", "??", "😀", "🔥🔥", "WKWKWK", "90'", "(skor)", "\n"]
+
+
+def clean_text_old(text):
+    """Salinan clean_text sebelum optimasi, sebagai pembanding."""
+    if not isinstance(text, str): return ""
+    text = text.lower()
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = text.strip()
+    text = re.sub(r'\s+', ' ', text)
+    if stopword_remover:
+        try:
+            text = stopword_remover.remove(text)
+        except:
+            pass
+    return text
+
+
+def synthetic_corpus(rows, seed=0):
+    """Komentar sintetis ala YouTube: campuran kata, mention, URL, angka, emoji."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(rows):
+        tokens = [rng.choice(_WORDS).capitalize() if rng.random() < 0.1 else rng.choice(_WORDS)
+                  for _ in range(rng.randint(3, 40))]
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(_EXTRAS))
+        corpus.append(' '.join(tokens))
+    return pd.Series(corpus)
+
+
+def bench(label, func, corpus, baseline=None):
+    start = time.perf_counter()
+    result = func(corpus)
+    elapsed = time.perf_counter() - start
+    rate = len(corpus) / elapsed
+    speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+    print(f"{label:<42} {rate:12.0f} baris/detik{speedup}")
+    return rate, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pembersihan teks.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Jumlah komentar sintetis.")
+    parser.add_argument("--csv", default=None, help="Pakai korpus dari CSV ini.")
+    parser.add_argument("--column", default="full_text", help="Kolom teks pada CSV.")
+    args = parser.parse_args()
+
+    corpus = pd.read_csv(args.csv, usecols=[args.column])[args.column] if args.csv else synthetic_corpus(args.rows)
+    print(f"[INFO] Korpus: {len(corpus)} baris\n")
+
+    baseline, old = bench("lama (clean_text_old via apply)", lambda s: s.apply(clean_text_old), corpus)
+    _, per_row = bench("clean_text via apply", lambda s: s.apply(clean_text), corpus, baseline)
+    _, exact = bench("clean_series(exact=True)", lambda s: clean_series(s, exact=True), corpus, baseline)
+    _, fast = bench("clean_series (default)", clean_series, corpus, baseline)
+    bench("clean_series(stem=True)", lambda s: clean_series(s, stem=True), corpus, baseline)
+
+    # Mode exact harus identik dengan fungsi lama
+    same = (old == per_row).all() and (old == exact).all()
+    print(f"\n[CEK] clean_text & clean_series(exact=True) identik dengan versi lama: {'ya' if same else 'TIDAK'}")
+    print(f"[CEK] Baris yang berbeda pada mode default (stopword dibuang semua): {(old != fast).sum()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_extraction.py
+#
+# Membandingkan throughput ekstraksi teks artikel: cara lama (html.parser,
+# seluruh halaman di-parse di event loop) vs cara baru (backend cepat +
+# SoupStrainer, serial dan lewat process pool).
+#
+# Usage: python -m benchmarks.bench_extraction [--dir benchmarks/fixtures] [--repeat 50]
+# Halaman tersimpan dibaca dari file bernama '<sumber>_article*.html' (mis. detik_article.html).
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from src.crawlers.extraction import extract_full_text
+from src.crawlers.parsing import HTML_PARSER, PARSE_WORKERS
+
+
+def extract_old(html, source):
+    """Salinan logika get_full_text sebelum optimasi, sebagai pembanding."""
+    soup = BeautifulSoup(html, 'html.parser')
+    if source == 'detik':
+        body = soup.find('div', class_='detail__body-text')
+        if body:
+            return ' '.join([p.get_text(strip=True) for p in body.find_all('p')])
+    elif source == 'kompas':
+        body = soup.find('div', class_='read__content')
+        if body:
+            for unwanted in body.select('.read__also, .ads-on-body, script, style, .kgnw-middle, .kompasidRec, .banner-300, .photo, .video, .twitter-tweet, iframe'):
+                unwanted.decompose()
+            return body.get_text(strip=True, separator=' ')
+    return None
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*_article*.html'))):
+        source = os.path.basename(path).split('_')[0]
+        with open(path, encoding='utf-8') as f:
+            pages.append((source, f.read()))
+    return pages
+
+
+def available_backends():
+    backends = ['html.parser']
+    for backend, module in (('lxml', 'lxml'), ('selectolax', 'selectolax.lexbor')):
+        try:
+            __import__(module)
+            backends.append(backend)
+        except ImportError:
+            pass
+    return backends
+
+
+def bench(label, func, jobs):
+    start = time.perf_counter()
+    func(jobs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {len(jobs) / elapsed:10.1f} halaman/detik")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ekstraksi teks artikel.")
+    parser.add_argument("--dir", default=os.path.join(os.path.dirname(__file__), 'fixtures'), help="Folder halaman HTML tersimpan.")
+    parser.add_argument("--repeat", type=int, default=50, help="Berapa kali setiap halaman diproses.")
+    args = parser.parse_args()
+
+    pages = load_pages(args.dir)
+    if not pages:
+        print(f"[ERROR] Tidak ada file *_article*.html di '{args.dir}'.")
+        return
+    jobs = pages * args.repeat
+
+    # Pastikan hasil ekstraksi tidak berubah sebelum mengukur kecepatan
+    for source, html in pages:
+        old, new = extract_old(html, source), extract_full_text(html, source)
+        status = "sama" if old == new else "BERBEDA"
+        print(f"[CEK] {source}: hasil lama vs baru {status} ({len(old or '')} vs {len(new or '')} karakter)")
+
+    print(f"\n[INFO] {len(pages)} halaman x {args.repeat} ulangan | backend: {HTML_PARSER} | worker: {PARSE_WORKERS}\n")
+    bench("lama (html.parser, halaman penuh)", lambda js: [extract_old(h, s) for s, h in js], jobs)
+    for backend in available_backends():
+        bench(f"baru ({backend}, subtree artikel saja)", lambda js: [extract_full_text(h, s, backend) for s, h in js], jobs)
+
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        sources, htmls = zip(*jobs)
+        bench(f"baru ({HTML_PARSER}) + process pool", lambda js: list(pool.map(extract_full_text, htmls, sources, chunksize=8)), jobs)
+
+
+if __name__ == '__main__':
+    main()
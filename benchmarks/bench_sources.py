@@ -0,0 +1,102 @@
+# benchmarks/bench_sources.py
+#
+# Benchmark throughput ekstraksi per sumber yang terdaftar di
+# src/crawlers/extraction.py, memakai fixture HTML tersimpan:
+#   benchmarks/fixtures/<sumber>_article*.html  -> extract_full_text
+#   benchmarks/fixtures/<sumber>_listing*.html  -> parse_listing
+#
+# Usage:
+#   python -m benchmarks.bench_sources --save-baseline   # catat baseline mesin ini
+#   python -m benchmarks.bench_sources                    # bandingkan dengan baseline
+# Keluar dengan kode 1 jika ada sumber yang lebih lambat dari baseline x toleransi,
+# jika ekstraksi pada fixture menghasilkan teks/daftar kosong, atau jika tanggal
+# di halaman daftar tidak bisa dinormalisasi (baris seperti itu dibuang saat preprocessing).
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from src.crawlers.extraction import SOURCES, extract_full_text, parse_listing
+from src.crawlers.parsing import HTML_PARSER
+from src.preprocessing.dates import normalize_dates
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline_sources.json')
+
+
+def load_fixtures(directory, source, kind):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, f'{source}_{kind}*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def measure(func, pages, source, repeat):
+    """Mengembalikan (halaman/detik, hasil ekstraksi halaman pertama)."""
+    first = func(pages[0], source)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            func(html, source)
+    elapsed = time.perf_counter() - start
+    return (len(pages) * repeat) / elapsed, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ekstraksi per sumber.")
+    parser.add_argument("--dir", default=FIXTURES_DIR, help="Folder fixture HTML.")
+    parser.add_argument("--repeat", type=int, default=30, help="Berapa kali setiap fixture diproses.")
+    parser.add_argument("--tolerance", type=float, default=0.7, help="Batas minimal terhadap baseline (0.7 = boleh 30%% lebih lambat).")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH) and not args.save_baseline:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    print(f"[INFO] Backend: {HTML_PARSER} | ulangan: {args.repeat}\n")
+    results = {}
+    failed = False
+    for source in SOURCES:
+        for kind, func in (('article', extract_full_text), ('listing', parse_listing)):
+            pages = load_fixtures(args.dir, source, kind)
+            if not pages:
+                print(f"  - {source}/{kind}: tidak ada fixture, dilewati.")
+                continue
+            key = f"{HTML_PARSER}:{source}:{kind}"
+            rate, first = measure(func, pages, source, args.repeat)
+            results[key] = rate
+
+            note = ""
+            unparsed = 0
+            if kind == 'listing' and first:
+                unparsed = int(normalize_dates([item.get('publish_date') for item in first]).isna().sum())
+            if not first:
+                note = "  <-- HASIL KOSONG"
+                failed = True
+            elif unparsed:
+                note = f"  <-- {unparsed} TANGGAL TIDAK TERBACA"
+                failed = True
+            elif key in baseline:
+                ratio = rate / baseline[key]
+                note = f"  ({ratio:.2f}x baseline)"
+                if ratio < args.tolerance:
+                    note += "  <-- REGRESI"
+                    failed = True
+            print(f"{source + '/' + kind:<20} {rate:10.1f} halaman/detik{note}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[INFO] Baseline disimpan ke '{BASELINE_PATH}'.")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,8 @@
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-from src.crawlers.twitter_crawler import crawl_twitter
+from src.crawlers.twitter_crawler import crawl_twitter, mark_exported
+from src.utils.raw_dataset import RAW_DATASET_DIR, RawDatasetWriter
 
 def main():
     print("=============================================")
@@ -39,10 +40,13 @@ def main():
     )
 
     if df_twitter is not None and not df_twitter.empty:
-        output_path = 'data/raw/twitter_posts_raw.csv'
-        # Gunakan mode 'append' agar bisa menambah data di lain waktu
-        df_twitter.to_csv(output_path, mode='a', index=False, header=not os.path.exists(output_path))
-        print(f"[SUCCESS] {len(df_twitter)} tweet baru disimpan/ditambahkan ke '{output_path}'.")
+        # Tweet baru ditambahkan sebagai file Parquet di partisi hari ini
+        writer = RawDatasetWriter(source_type='twitter')
+        writer.write_many(df_twitter.to_dict('records'))
+        writer.close()
+        print(f"[SUCCESS] {writer.count} tweet baru ditambahkan ke dataset '{RAW_DATASET_DIR}'.")
+        # Shard yang sudah tersimpan tidak akan diambil/diekspor ulang pada run berikutnya
+        mark_exported()
     else:
         print("[FAILED] Tidak ada data yang berhasil diambil dari Twitter.")
 
@@ -1,20 +1,23 @@
 # crawl_youtube.py
 
 import os
-import time
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from tqdm import tqdm
-import pandas as pd
-from langdetect import detect, LangDetectException
 from dotenv import load_dotenv
+from src.crawlers.youtube_quota import QuotaBudget, QuotaExhausted
+from src.crawlers.youtube_state import VideoSyncState
+from src.preprocessing.language_filter import LanguageFilter
+from src.utils.raw_dataset import RAW_DATASET_DIR, RawDatasetWriter
 
 # Muat variabel dari file .env (termasuk YT_API_KEY)
 load_dotenv()
 
 # ---------- KONFIGURASI CRAWLING YOUTUBE ----------
 # Anda bisa mengubah semua pengaturan di sini
-OUTPUT_CSV = "data/raw/youtube_comments_raw.csv" # Simpan di folder data/raw
 QUERIES = [
     "Timnas Indonesia Kualifikasi Piala Dunia 2026",
     "Indonesia vs Irak Kualifikasi",
@@ -23,21 +26,47 @@ QUERIES = [
     "Garuda di Dada"
 ]
 MAX_VIDEOS_PER_QUERY = 50         # Ambil 10 video teratas dari setiap pencarian
-MAX_COMMENTS_PER_VIDEO = 200      # Ambil 200 komentar teratas dari setiap video
+MAX_COMMENTS_PER_VIDEO = 200      # Ambil 200 komentar terbaru dari setiap video per kunjungan
 FILTER_INDONESIAN = True          # Hanya ambil komentar berbahasa Indonesia
+COMMENT_WORKERS = 8               # Jumlah video yang diambil komentarnya bersamaan
+DAILY_QUOTA = 10000               # Kuota harian YouTube Data API (unit)
+QUOTA_RESERVE = 200               # Unit cadangan yang tidak dipakai crawler ini
+DEFERRED_PATH = "data/state/youtube_deferred.json"  # Video yang ditunda karena kuota habis
 # ---------------------------------------------------
 
+# Satu filter bahasa dipakai bersama agar cache-nya berlaku untuk semua video
+LANGUAGE_FILTER = LanguageFilter()
+
 def get_youtube_service():
-    """Membuat dan mengembalikan service object untuk YouTube API."""
+    """
+    Membuat dan mengembalikan service object untuk YouTube API.
+    YT_API_ENDPOINT (opsional) mengarahkan client ke server lain, mis. stub lokal.
+    """
     api_key = os.getenv("YT_API_KEY")
     if not api_key:
         raise ValueError("YT_API_KEY tidak ditemukan di file .env. Harap tambahkan API Key Anda.")
-    return build("youtube", "v3", developerKey=api_key, cache_discovery=False)
+    endpoint = os.getenv("YT_API_ENDPOINT")
+    client_options = {"api_endpoint": endpoint} if endpoint else None
+    return build("youtube", "v3", developerKey=api_key, cache_discovery=False, client_options=client_options)
+
+def make_thread_local_service(factory=get_youtube_service):
+    """
+    Service object googleapiclient tidak thread-safe, jadi setiap thread worker
+    membuat service-nya sendiri sekali saja.
+    """
+    local = threading.local()
+    def get_service():
+        if not hasattr(local, "service"):
+            local.service = factory()
+        return local.service
+    return get_service
 
-def search_videos(yt_service, query, max_results):
-    """Mencari video berdasarkan query."""
+def search_videos(yt_service, query, max_results, budget=None):
+    """Mencari video berdasarkan query. Melempar QuotaExhausted jika kuota tidak cukup."""
     print(f"\n[INFO] Mencari video untuk query: '{query}'...")
     videos = []
+    if budget is not None:
+        budget.spend('search.list')
     try:
         response = yt_service.search().list(
             q=query, part="id,snippet", type="video", maxResults=max_results,
@@ -53,17 +82,41 @@ def search_videos(yt_service, query, max_results):
         print(f"   - ERROR saat mencari video: {e}")
     return videos
 
-def fetch_comments_for_video(yt_service, video_id, max_comments):
-    """Mengambil komentar dari satu video."""
+def fetch_comments_for_video(yt_service, video_id, max_comments, budget=None, sync_state=None):
+    """
+    Mengambil komentar dari satu video. Jika kuota habis di tengah jalan,
+    komentar yang sudah terkumpul tetap dikembalikan.
+
+    Komentar selalu diambil urut waktu (terbaru dulu). Jika `sync_state`
+    (VideoSyncState) sudah punya watermark untuk video ini, pengambilan berhenti
+    begitu melewati watermark; komentar yang ID-nya sudah pernah disimpan
+    dilewati. Watermark maju ke `publishedAt` terbaru yang diproses, termasuk
+    saat terpotong batas `max_comments` (yang diambil adalah komentar terbaru).
+    Jika berhenti karena kuota habis atau error, hanya ID komentar yang sudah
+    dikembalikan yang dicatat; watermark tidak maju sehingga dicoba lagi utuh.
+    """
     comments = []
     next_page_token = None
     fetched_count = 0
+    video_state = sync_state.get(video_id) if sync_state is not None else None
+    watermark = video_state.get('newest_published_at') if video_state else None
+    known_ids = set(video_state['comment_ids']) if video_state else set()
+    newest_seen = None          # publishedAt terbaru yang diproses pada crawl ini
+    new_seen = 0                # komentar baru (sebelum filter bahasa), untuk jadwal kunjungan
+    aborted = False             # kuota habis / error: watermark dan jadwal tidak diubah
     
     while True:
+        if budget is not None:
+            try:
+                budget.spend('commentThreads.list')
+            except QuotaExhausted:
+                print(f"   - Kuota habis saat mengambil komentar video {video_id}. Berhenti.")
+                aborted = True
+                break
         try:
             response = yt_service.commentThreads().list(
                 part="snippet", videoId=video_id, maxResults=100,
-                pageToken=next_page_token, textFormat="plainText"
+                pageToken=next_page_token, textFormat="plainText", order="time"
             ).execute()
         except HttpError as e:
             # Jika komentar dinonaktifkan, lewati video ini
@@ -71,83 +124,137 @@ def fetch_comments_for_video(yt_service, video_id, max_comments):
                 print(f"   - Komentar dinonaktifkan untuk video {video_id}. Melewati.")
                 break
             print(f"   - ERROR saat mengambil komentar: {e}")
+            aborted = True
             break # Hentikan jika ada error lain
 
+        page_comments = []
+        reached_watermark = False
         for item in response.get("items", []):
-            comment = item["snippet"]["topLevelComment"]["snippet"]
-            
-            text = comment.get("textDisplay", "")
-            # Lakukan filter bahasa di sini
-            if FILTER_INDONESIAN:
-                try:
-                    if detect(text) != "id":
-                        continue
-                except LangDetectException:
-                    continue # Lewati teks yang terlalu pendek untuk dideteksi
-            
-            comments.append({
+            top_level = item["snippet"]["topLevelComment"]
+            comment = top_level["snippet"]
+            published_at = comment.get('publishedAt')
+            if watermark and published_at and published_at <= watermark:
+                reached_watermark = True
+                break
+            if published_at and (newest_seen is None or published_at > newest_seen):
+                newest_seen = published_at
+            # Sudah disimpan pada crawl sebelumnya yang tidak tuntas
+            if top_level.get('id') in known_ids:
+                continue
+            new_seen += 1
+            page_comments.append({
+                'item_id': top_level.get('id'),
                 'source_type': 'youtube',
                 'source': comment.get('authorChannelUrl', 'N/A'),
                 'author': comment.get('authorDisplayName', 'N/A'),
                 'publish_date': comment.get('publishedAt'),
-                'full_text': text,
+                'full_text': comment.get("textDisplay", ""),
                 'likes': comment.get('likeCount', 0),
                 'url': f"https://www.youtube.com/watch?v={video_id}",
                 'title': f"Komentar di video: {video_id}" # Judul placeholder
             })
-            fetched_count += 1
-            if fetched_count >= max_comments:
-                break
+
+        # Filter bahasa dijalankan per halaman sebagai satu batch (dengan cache)
+        if FILTER_INDONESIAN:
+            page_comments = LANGUAGE_FILTER.filter(page_comments, lang='id')
+
+        truncated = len(page_comments) > max_comments - fetched_count
+        page_comments = page_comments[:max_comments - fetched_count]
+        comments.extend(page_comments)
+        fetched_count += len(page_comments)
         
         next_page_token = response.get("nextPageToken")
-        if not next_page_token or fetched_count >= max_comments:
+        if truncated or reached_watermark or not next_page_token or fetched_count >= max_comments:
             break
-            
+
+    if sync_state is not None:
+        emitted_ids = [c['item_id'] for c in comments]
+        if aborted:
+            sync_state.record_partial(video_id, emitted_ids)
+        else:
+            sync_state.record(video_id, emitted_ids, new_count=new_seen, newest_published_at=newest_seen)
     return comments
 
-def main():
-    """Fungsi utama untuk menjalankan pipeline crawling YouTube."""
+def load_deferred_videos():
+    if not os.path.exists(DEFERRED_PATH):
+        return []
+    with open(DEFERRED_PATH) as f:
+        return json.load(f)
+
+def save_deferred_videos(videos):
+    os.makedirs(os.path.dirname(DEFERRED_PATH), exist_ok=True)
+    with open(DEFERRED_PATH, 'w') as f:
+        json.dump(videos, f)
+
+def main(service_factory=get_youtube_service):
+    """
+    Fungsi utama untuk menjalankan pipeline crawling YouTube.
+    `service_factory` bisa diganti dengan pembuat stub API untuk pengujian lokal.
+    """
     print("=============================================")
     print("🚀 MEMULAI CRAWLING YOUTUBE (OPINI PUBLIK) 🚀")
     print("=============================================")
     os.makedirs('data/raw', exist_ok=True)
     
     try:
-        yt_service = get_youtube_service()
+        yt_service = service_factory()
     except ValueError as e:
         print(f"[FATAL ERROR] {e}")
         return
 
     all_new_comments = []
+    budget = QuotaBudget(DAILY_QUOTA, reserve=QUOTA_RESERVE)
+    sync_state = VideoSyncState()
+    print(f"[INFO] Sisa kuota API hari ini: {budget.remaining} unit.")
     
-    # Cari video dari semua query
-    all_videos = []
+    # Video yang tertunda dari run sebelumnya didahulukan (tidak perlu search ulang)
+    all_videos = load_deferred_videos()
     for query in QUERIES:
-        all_videos.extend(search_videos(yt_service, query, MAX_VIDEOS_PER_QUERY))
-        time.sleep(1) # Jeda antar pencarian
+        try:
+            all_videos.extend(search_videos(yt_service, query, MAX_VIDEOS_PER_QUERY, budget))
+        except QuotaExhausted as e:
+            print(f"   - {e}. Pencarian berikutnya dilewati.")
+            break
+
+    # Video yang pernah di-crawl ikut dikunjungi ulang jika sudah jadwalnya
+    all_videos = [{'videoId': video_id} for video_id in sync_state.videos] + all_videos
 
-    # Hapus duplikat video yang mungkin ditemukan dari query berbeda
+    # Hapus duplikat video yang mungkin ditemukan dari query berbeda, lalu
+    # lewati video yang belum waktunya dikunjungi ulang
     unique_videos = list({v['videoId']:v for v in all_videos}.values())
-    print(f"\n[INFO] Total video unik yang akan di-crawl: {len(unique_videos)}")
+    due_videos = [v for v in unique_videos if sync_state.is_due(v['videoId'])]
+    print(f"\n[INFO] Total video unik: {len(unique_videos)}, yang akan di-crawl sekarang: {len(due_videos)}")
+    unique_videos = due_videos
 
-    # Ambil komentar dari setiap video unik
-    for video in tqdm(unique_videos, desc="Mengambil Komentar Video"):
-        comments = fetch_comments_for_video(yt_service, video['videoId'], MAX_COMMENTS_PER_VIDEO)
-        all_new_comments.extend(comments)
-        time.sleep(1) # Jeda sopan antar video
+    # Ambil komentar dari beberapa video sekaligus; video yang belum sempat
+    # dimulai saat kuota habis disimpan untuk run berikutnya
+    deferred = []
+    get_service = make_thread_local_service(service_factory)
+    def crawl_video(video):
+        if budget.remaining < 1:
+            deferred.append(video)
+            return []
+        return fetch_comments_for_video(get_service(), video['videoId'], MAX_COMMENTS_PER_VIDEO, budget, sync_state)
+
+    with ThreadPoolExecutor(max_workers=COMMENT_WORKERS) as executor:
+        futures = [executor.submit(crawl_video, video) for video in unique_videos]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Mengambil Komentar Video"):
+            all_new_comments.extend(future.result())
+
+    budget.save()
+    sync_state.save()
+    save_deferred_videos(deferred)
+    print(f"\n[INFO] Kuota terpakai hari ini: {budget.used} unit ({budget.calls}).")
+    print(f"[INFO] Deteksi bahasa: {LANGUAGE_FILTER.misses} teks diklasifikasi, {LANGUAGE_FILTER.hits} dari cache.")
+    if deferred:
+        print(f"[INFO] {len(deferred)} video ditunda ke run berikutnya karena kuota habis.")
 
     if all_new_comments:
-        df_youtube = pd.DataFrame(all_new_comments)
-        
-        # Simpan atau tambahkan data baru ke file CSV
-        if os.path.exists(OUTPUT_CSV):
-            print(f"\n[INFO] Menambahkan {len(df_youtube)} komentar baru ke file yang ada...")
-            df_youtube.to_csv(OUTPUT_CSV, mode='a', index=False, header=False)
-        else:
-            print(f"\n[INFO] Membuat file baru dan menyimpan {len(df_youtube)} komentar...")
-            df_youtube.to_csv(OUTPUT_CSV, mode='w', index=False, header=True)
-            
-        print(f"[SUCCESS] Proses selesai. Data disimpan di '{OUTPUT_CSV}'.")
+        # Komentar baru ditambahkan sebagai file Parquet di partisi hari ini
+        writer = RawDatasetWriter(source_type='youtube')
+        writer.write_many(all_new_comments)
+        writer.close()
+        print(f"\n[SUCCESS] {writer.count} komentar baru ditambahkan ke dataset '{RAW_DATASET_DIR}'.")
     else:
         print("\n[INFO] Tidak ada komentar baru yang ditemukan.")
         
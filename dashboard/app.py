@@ -8,8 +8,16 @@ from collections import Counter
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 import os
+import sys
 from datetime import datetime
 
+# Root repo ke sys.path agar modul src/ bisa diimpor saat dijalankan via `streamlit run`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.preprocessing.token_matrix import TOKEN_MATRIX_DIR, TokenMatrix, matrix_version
+from src.preprocessing.tokenizer import STOPWORDS, TOPIC_WORDS, tokenize
+
+DASHBOARD_STOPWORDS = STOPWORDS | TOPIC_WORDS
+
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(
     page_title="Analisis Sentimen: Timnas di Mata Media & Publik",
@@ -86,6 +94,26 @@ def load_data(path):
     except FileNotFoundError:
         return None
 
+@st.cache_resource(max_entries=1)
+def load_token_matrix(directory, version):
+    """Matriks token hasil preprocessing (None jika belum dibuat). `version` hanya kunci cache."""
+    return TokenMatrix.load(directory)
+
+def current_token_matrix():
+    """Matriks token terbaru: dimuat ulang begitu run_preprocessing mengubah artefaknya."""
+    return load_token_matrix(TOKEN_MATRIX_DIR, matrix_version(TOKEN_MATRIX_DIR))
+
+def token_rows(df, matrix):
+    """
+    Posisi baris `df` di `matrix`, atau None jika matriks tidak tersedia
+    atau tidak mencakup semua baris (mis. data dari preprocessing versi lama).
+    """
+    if matrix is None or 'content_hash' not in df.columns:
+        return None
+    keys = df.loc[df['cleaned_full_text'].notna(), 'content_hash']
+    rows = matrix.rows_for(keys)
+    return rows if len(rows) == len(keys) else None
+
 def create_sentiment_donut_chart(df):
     """Membuat donut chart untuk distribusi sentimen keseluruhan."""
     sentiment_counts = df['sentiment_label'].value_counts()
@@ -177,13 +205,15 @@ def create_top_keywords_chart(df, source_type, top_n=15):
     if 'cleaned_full_text' not in df.columns or df['cleaned_full_text'].dropna().empty:
         return None
     
-    stopwords_tambahan = {'yg', 'gak', 'piala', 'dunia', 'vs', 'detik', 'com', 
-                          'juga', 'akan', 'namun', 'baca', 'kata', 'tim', 'nya', 'skuad',
-                          'yang', 'ini', 'itu', 'dari', 'untuk', 'pada', 'adalah', 'dengan'}
-    
-    full_text = ' '.join(df['cleaned_full_text'].dropna()).lower().split()
-    filtered_words = [word for word in full_text if word not in stopwords_tambahan and len(word) > 3]
-    word_freq = Counter(filtered_words).most_common(top_n)
+    matrix = current_token_matrix()
+    rows = token_rows(df, matrix)
+    if rows is not None:
+        word_freq = matrix.top_terms(top_n, rows, DASHBOARD_STOPWORDS, min_length=4)
+    else:
+        word_counts = Counter()
+        for text in df['cleaned_full_text'].dropna():
+            word_counts.update(tokenize(text, DASHBOARD_STOPWORDS, min_length=4))
+        word_freq = word_counts.most_common(top_n)
     
     if not word_freq:
         return None
@@ -212,15 +242,22 @@ def create_word_cloud(df, title):
     if 'cleaned_full_text' not in df.columns or df['cleaned_full_text'].dropna().empty:
         return None
     
-    full_text = ' '.join(df['cleaned_full_text'].dropna())
-    stopwords_tambahan = ['timnas', 'indonesia', 'piala', 'dunia', 'vs', 'detik', 'com', 
-                          'juga', 'akan', 'namun', 'baca', 'kata', 'tim', 'garuda', 'skuad', 'yg', 'gak', 'nya', 'ga', 'sama', 'aja']
-    
     wordcloud = WordCloud(
         width=800, height=400, background_color='white',
-        colormap='viridis', stopwords=stopwords_tambahan,
+        colormap='viridis', stopwords=DASHBOARD_STOPWORDS,
         max_words=100, relative_scaling=0.5
-    ).generate(full_text)
+    )
+    matrix = current_token_matrix()
+    rows = token_rows(df, matrix)
+    if rows is not None:
+        frequencies = matrix.frequencies(
+            rows, DASHBOARD_STOPWORDS, min_length=2, limit=wordcloud.max_words
+        )
+        if not frequencies:
+            return None
+        wordcloud.generate_from_frequencies(frequencies)
+    else:
+        wordcloud.generate(' '.join(df['cleaned_full_text'].dropna()))
     
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.imshow(wordcloud, interpolation='bilinear')
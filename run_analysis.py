@@ -9,7 +9,6 @@
 import os
 import sys
 import time
-import math
 import argparse
 import pandas as pd
 import torch
@@ -26,6 +25,9 @@ BATCH_SIZE_CPU = 4      # aman untuk laptop CPU tanpa GPU
 BATCH_SIZE_GPU = 32     # jika ada GPU, bisa dinaikkan
 CHECKPOINT_INTERVAL = 5 # simpan checkpoint tiap N batch (ganti kalau mau)
 TRUNCATE_LENGTH = 256   # max chars to send ke model (mengurangi token)
+MAX_TOKENS_CPU = 2048   # anggaran token per batch (jumlah teks x panjang terpanjang, termasuk padding)
+MAX_TOKENS_GPU = 16384
+MAX_BATCH_ITEMS = 64    # batas jumlah teks per batch (untuk komentar yang sangat pendek)
 CPU_NUM_THREADS = 2     # batasi agar laptop tidak panas berlebih
 
 # ----------------------
@@ -53,6 +55,42 @@ def save_dataframe(df, path):
     safe_mkdir(os.path.dirname(path) or ".")
     df.to_csv(path, index=False)
 
+def token_lengths(tokenizer, texts):
+    """Panjang token setiap teks (termasuk token spesial, setelah truncation model)."""
+    encoded = tokenizer(texts, truncation=True, add_special_tokens=True)
+    return [len(ids) for ids in encoded['input_ids']]
+
+def make_token_batches(lengths, max_tokens, max_items=MAX_BATCH_ITEMS):
+    """Urutkan teks menurut panjang token, lalu bentuk batch selama
+       (jumlah teks x panjang terpanjang) <= max_tokens. Isi batch = posisi asli teks,
+       sehingga hasil bisa dikembalikan ke urutan semula.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches, current = [], []
+    for pos in order:
+        # Urutan naik: teks ini selalu yang terpanjang di batch berjalan
+        if current and ((len(current) + 1) * lengths[pos] > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current = []
+        current.append(pos)
+    if current:
+        batches.append(current)
+    return batches
+
+def make_fixed_batches(n, batch_size):
+    """Batch ukuran tetap sesuai urutan korpus (perilaku lama)."""
+    return [list(range(start, min(start + batch_size, n))) for start in range(0, n, batch_size)]
+
+def padding_ratio(batches, lengths):
+    """Porsi token padding dari seluruh token yang diproses model."""
+    padded = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+    return 1 - sum(lengths) / padded if padded else 0.0
+
+def label_and_score(res):
+    if isinstance(res, dict):
+        return res.get('label', 'error'), res.get('score', 0.0)
+    return 'error', 0.0
+
 def choose_model_name():
     """Pilih model adaptif: jika ada GPU, pakai Roberta sentiment (lebih kuat).
        Jika CPU-only, pakai model ringan untuk inference lebih cepat dan aman.
@@ -74,6 +112,10 @@ def main():
     parser.add_argument("--checkpoint", "-c", default=CHECKPOINT_PATH, help="Path to checkpoint CSV for resume.")
     parser.add_argument("--batch-size", "-b", type=int, default=None, help="Override batch size (auto by default).")
     parser.add_argument("--force-model", "-m", default=None, help="Force a specific HF model name.")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                        help="Token budget per batch (auto by default: CPU 2048, GPU 16384).")
+    parser.add_argument("--fixed-batches", action="store_true",
+                        help="Use fixed-size batches in corpus order (old behaviour, for comparison).")
     args = parser.parse_args()
 
     input_path = args.input
@@ -161,106 +203,93 @@ def main():
     original_indices = df_to_analyze['index'].tolist()
     texts = df_to_analyze['cleaned_full_text'].str[:TRUNCATE_LENGTH].tolist()
 
-    num_batches = math.ceil(len(texts) / batch_size)
-    print(f"[INFO] Total batch: {num_batches}")
+    # --- penjadwalan batch: urut panjang token + anggaran token per batch ---
+    lengths = token_lengths(sentiment_classifier.tokenizer, texts)
+    fixed = make_fixed_batches(len(texts), batch_size)
+    if args.fixed_batches:
+        batches = fixed
+    else:
+        max_tokens = args.max_tokens or (MAX_TOKENS_GPU if device == 0 else MAX_TOKENS_CPU)
+        batches = make_token_batches(lengths, max_tokens, max_items=max(batch_size, MAX_BATCH_ITEMS))
+    print(f"[INFO] Total batch: {len(batches)} | Total token: {sum(lengths)} | "
+          f"Padding: {padding_ratio(batches, lengths):.1%} "
+          f"(batch tetap {batch_size} urutan korpus: {padding_ratio(fixed, lengths):.1%})")
 
     results = [None] * len(texts)  # placeholder for preserving order
-    # If checkpoint existed and provided partial results, try reuse them (merging already done earlier)
+
+    def apply_results(positions):
+        # map results (by original position) back into master df
+        for pos in positions:
+            if results[pos] is None:
+                continue
+            label, score = label_and_score(results[pos])
+            try:
+                df.at[original_indices[pos], 'sentiment'] = label
+                df.at[original_indices[pos], 'sentiment_score'] = score
+            except Exception:
+                # ignore if index missing
+                pass
 
     # --- batch loop with tqdm console progress ---
+    pending = []            # posisi yang hasilnya belum masuk checkpoint
+    processed_tokens = 0
+    started = time.perf_counter()
     try:
-        for b in tqdm(range(num_batches), desc="Menganalisis Sentimen", unit="batch"):
-            start = b * batch_size
-            end = min(start + batch_size, len(texts))
-            batch_texts = texts[start:end]
-            # call model on batch
+        for b, batch in enumerate(tqdm(batches, desc="Menganalisis Sentimen", unit="batch")):
+            batch_texts = [texts[pos] for pos in batch]
+            # call model on batch (batch_size = isi batch, padding hanya sampai teks terpanjang di batch)
             try:
-                batch_results = sentiment_classifier(batch_texts)
-                # sometimes pipeline returns labels in same order => assign
-                for i, res in enumerate(batch_results):
-                    results[start + i] = res
+                batch_results = sentiment_classifier(batch_texts, batch_size=len(batch_texts), truncation=True)
+                for pos, res in zip(batch, batch_results):
+                    results[pos] = res
             except Exception as batch_err:
                 # fallback: process single-by-single for robustness
-                print(f"\n[WARN] Batch {b+1} gagal ({batch_err}). Mencoba single-item fallback...")
-                for i, txt in enumerate(batch_texts):
+                tqdm.write(f"[WARN] Batch {b+1} gagal ({batch_err}). Mencoba single-item fallback...")
+                for pos, txt in zip(batch, batch_texts):
                     try:
-                        single_res = sentiment_classifier(txt)
+                        single_res = sentiment_classifier(txt, truncation=True)
                         # pipeline returns list even for single string; normalize:
                         if isinstance(single_res, list):
                             single_res = single_res[0] if len(single_res) > 0 else {'label': 'error', 'score': 0.0}
-                        results[start + i] = single_res
+                        results[pos] = single_res
                     except Exception as single_err:
-                        print(f"[WARN] Single text at idx {start+i} gagal: {single_err}. Mark as error.")
-                        results[start + i] = {'label': 'error', 'score': 0.0}
+                        tqdm.write(f"[WARN] Single text at idx {pos} gagal: {single_err}. Mark as error.")
+                        results[pos] = {'label': 'error', 'score': 0.0}
+            pending.extend(batch)
+            processed_tokens += sum(lengths[pos] for pos in batch)
+
             # checkpoint save every N batches
-            if (b + 1) % CHECKPOINT_INTERVAL == 0 or (b + 1) == num_batches:
-                # map results back into a small df chunk and update master df
-                chunk_indices = original_indices[start:end]
-                chunk_labels = [ (r.get('label','error') if isinstance(r, dict) else 'error') for r in results[start:end] ]
-                chunk_scores = [ (r.get('score',0.0) if isinstance(r, dict) else 0.0) for r in results[start:end] ]
-                # create small df to update
-                df_chunk = pd.DataFrame({
-                    'index': chunk_indices,
-                    'sentiment': chunk_labels,
-                    'sentiment_score': chunk_scores
-                }).set_index('index')
-                # update original df by index
-                df = df.set_index(df.index)  # ensure index is index
-                # map values (we'll use .loc for indices)
-                for idx, row in df_chunk.iterrows():
-                    # idx corresponds to original df index
-                    try:
-                        df.at[idx, 'sentiment'] = row['sentiment']
-                        df.at[idx, 'sentiment_score'] = row['sentiment_score']
-                    except Exception:
-                        # ignore if index missing
-                        pass
-                # persist checkpoint to allow resume later
-                # write subset of main df (only rows with non-null sentiment) to checkpoint
+            if (b + 1) % CHECKPOINT_INTERVAL == 0 or (b + 1) == len(batches):
+                apply_results(pending)
+                pending = []
                 try:
                     # save full df (safe) as checkpoint and final to avoid data loss
                     save_dataframe(df.reset_index(drop=False), ckpt_path)
                     save_dataframe(df.reset_index(drop=False), out_path)
-                    tqdm.write(f"[INFO] Checkpoint & partial results saved at batch {b+1}.")
+                    elapsed = time.perf_counter() - started
+                    tqdm.write(f"[INFO] Checkpoint & partial results saved at batch {b+1} "
+                               f"({processed_tokens / elapsed:.0f} token/detik).")
                 except Exception as io_err:
                     tqdm.write(f"[WARN] Gagal menyimpan checkpoint: {io_err}")
 
     except KeyboardInterrupt:
         print("\n[WARN] Proses dihentikan manual (KeyboardInterrupt). Menyimpan checkpoint terakhir...")
-        # perform saving similar to checkpoint: update df with any gathered results so far
-        # map all filled results back
-        for pos, res in enumerate(results):
-            if res is None:
-                continue
-            orig_idx = original_indices[pos]
-            label = res.get('label','error') if isinstance(res, dict) else 'error'
-            score = res.get('score', 0.0) if isinstance(res, dict) else 0.0
-            try:
-                df.at[orig_idx, 'sentiment'] = label
-                df.at[orig_idx, 'sentiment_score'] = score
-            except Exception:
-                pass
+        apply_results(pending)
         save_dataframe(df.reset_index(drop=False), ckpt_path)
         save_dataframe(df.reset_index(drop=False), out_path)
         print(f"[INFO] Checkpoint & partial saved to '{ckpt_path}' and '{out_path}'. Keluar.")
         sys.exit(0)
 
     # --- end batch loop ---
-    # map remaining results back to df
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] {len(texts)} teks / {processed_tokens} token dalam {elapsed:.1f} detik "
+          f"({processed_tokens / elapsed:.0f} token/detik, {len(texts) / elapsed:.1f} teks/detik).")
+
+    # mark unprocessed results as error
     for pos, res in enumerate(results):
         if res is None:
-            # mark as error/unprocessed
-            label = 'error'
-            score = 0.0
-        else:
-            label = res.get('label','error') if isinstance(res, dict) else 'error'
-            score = res.get('score', 0.0) if isinstance(res, dict) else 0.0
-        orig_idx = original_indices[pos]
-        try:
-            df.at[orig_idx, 'sentiment'] = label
-            df.at[orig_idx, 'sentiment_score'] = score
-        except Exception:
-            pass
+            results[pos] = {'label': 'error', 'score': 0.0}
+    apply_results(range(len(results)))
 
     # final save
     save_dataframe(df.reset_index(drop=False), out_path)
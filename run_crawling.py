@@ -1,13 +1,35 @@
 # run_crawling.py
 
-import pandas as pd
 import asyncio
 import os
 from src.crawlers.detik_crawler import crawl_detik
 from src.crawlers.kompas_crawler import crawl_kompas
 from src.crawlers.bola_crawler import crawl_bola
+from src.crawlers.seen_index import SeenUrlIndex
+from src.crawlers.pipeline import CsvSink, FAILURE_FIELDS, run_crawl_pipeline
+from src.crawlers.metrics import METRICS_JSON_PATH
+from src.crawlers.session import CrawlSession
+from src.utils.raw_dataset import RAW_DATASET_DIR, RawDatasetWriter
 # from src.crawlers.facebook_crawler import crawl_facebook
 
+def report_metrics(metrics):
+    """Ringkasan metrik per sumber ke terminal, JSON, dan (opsional) format Prometheus."""
+    metrics.write_json(METRICS_JSON_PATH)
+    print(f"\n[INFO] Ringkasan metrik crawling disimpan ke '{METRICS_JSON_PATH}'.")
+    for source, stats in metrics.summary()['sources'].items():
+        latency = stats['latency_seconds']
+        rate = stats['extraction_success_rate']
+        print(f"  - {source}: {stats['requests']} request, {stats['bytes'] / 1e6:.1f} MB, "
+              f"p50 {latency['p50']}s / p95 {latency['p95']}s, retry {stats['retries']}, "
+              f"ekstraksi {'-' if rate is None else f'{rate:.0%}'}, {stats['articles_per_sec']} artikel/detik")
+    for source in metrics.extraction_alerts():
+        print(f"[WARN] Ekstraksi '{source}' sebagian besar gagal; kemungkinan layout situs berubah.")
+    # Set CRAWL_METRICS_PROM=path/file.prom untuk textfile collector Prometheus
+    prom_path = os.getenv('CRAWL_METRICS_PROM')
+    if prom_path:
+        metrics.write_prometheus(prom_path)
+        print(f"[INFO] Metrik format Prometheus disimpan ke '{prom_path}'.")
+
 async def main():
     print("=============================================")
     print("🚀 MEMULAI STASIUN 1: CRAWLING DATA MENTAH 🚀")
@@ -18,28 +40,41 @@ async def main():
     # --- CRAWLING PORTAL BERITA ---
     print("\n[INFO] Menjalankan crawler portal berita...")
     # Anda bisa mengatur `total_pages` di sini, misal 5 halaman per sumber
-    news_tasks = [
-        crawl_detik(total_pages=70),
-        crawl_kompas(total_pages=70),
-        crawl_bola(total_pages=5)
-    ]
-    results_nested = await asyncio.gather(*news_tasks)
-    all_articles = [item for sublist in results_nested for item in sublist if sublist]
-    df_news = pd.DataFrame(all_articles)
-
-    if not df_news.empty:
-        # Simpan atau tambahkan ke file yang ada (mode 'a' = append)
-        output_path = 'data/raw/news_articles_raw.csv'
-        df_news.to_csv(output_path, mode='a', index=False, header=not os.path.exists(output_path))
-        print(f"\n[SUCCESS] {len(df_news)} artikel berita baru disimpan/ditambahkan ke '{output_path}'.")
+    # Artikel yang URL-nya sudah ada di index dilewati (crawling inkremental)
+    seen = SeenUrlIndex()
+    print(f"[INFO] {len(seen)} URL artikel sudah tercatat dari crawling sebelumnya.")
+    # Artikel ditulis bertahap ke dataset Parquet begitu teks lengkapnya didapat
+    sink = RawDatasetWriter(source_type='news')
+    # Artikel yang gagal dicatat terpisah (di luar data/raw) agar tidak ikut diproses
+    failures = CsvSink('data/state/crawl_failures.csv', fieldnames=FAILURE_FIELDS)
+    try:
+        # Satu sesi (pool koneksi) dipakai bersama oleh semua crawler dan worker
+        async with CrawlSession() as session:
+            news_producers = [
+                lambda q: crawl_detik(session, total_pages=70, seen=seen, queue=q),
+                lambda q: crawl_kompas(session, total_pages=70, seen=seen, queue=q),
+                lambda q: crawl_bola(session, total_pages=5, queue=q)
+            ]
+            saved = await run_crawl_pipeline(session, news_producers, sink, seen=seen, failures=failures)
+    finally:
+        try:
+            sink.close()
+            # Index URL disimpan setelah semua buffer sink tertulis ke disk;
+            # jika penulisan gagal, artikelnya akan di-crawl ulang
+            seen.save()
+        finally:
+            failures.close()
+    report_metrics(session.metrics)
+    if saved:
+        print(f"\n[SUCCESS] {saved} artikel berita baru ditambahkan ke dataset '{RAW_DATASET_DIR}'.")
 
     # --- CRAWLING FACEBOOK ---
     # `scroll_count` menentukan berapa banyak data baru yang diambil
-    # df_facebook = crawl_facebook(target_id='timnasindonesia', scroll_count=3)
-    # if df_facebook is not None and not df_facebook.empty:
-    #     output_path = 'data/raw/facebook_posts_raw.csv'
-    #     df_facebook.to_csv(output_path, mode='a', index=False, header=not os.path.exists(output_path))
-    #     print(f"[SUCCESS] {len(df_facebook)} postingan Facebook baru disimpan/ditambahkan ke '{output_path}'.")
+    # facebook_sink = RawDatasetWriter(source_type='facebook')
+    # saved_facebook = crawl_facebook(target_id='timnasindonesia', scroll_count=3, sink=facebook_sink)
+    # facebook_sink.close()
+    # if saved_facebook:
+    #     print(f"[SUCCESS] {saved_facebook} postingan Facebook baru ditambahkan ke dataset '{RAW_DATASET_DIR}'.")
 
     print("\n✅ Stasiun Crawling Selesai.")
 
@@ -1,50 +1,207 @@
 # run_preprocessing.py (Versi Final untuk Berita + YouTube)
 
+import argparse
 import pandas as pd
 import os
 import glob
-from src.preprocessing.cleaner import clean_text, format_date
+import time
+from src.preprocessing.cleaner import CLEANER_VERSION
+from src.preprocessing.incremental import (MASTER_PATH, MasterWriter, content_hashes, iter_master, load_known,
+                                           load_rejected, load_state, master_columns, save_rejected, save_state,
+                                           text_hashes)
+from src.preprocessing.near_dedup import NEAR_DUP_THRESHOLD, NearDuplicateIndex, find_near_duplicates
+from src.preprocessing.parallel import DEFAULT_WORKERS, PARALLEL_MIN_ROWS, make_pool, preprocess_columns
+from src.preprocessing.token_matrix import TOKEN_MATRIX_DIR, TokenMatrixWriter
+from src.utils.raw_dataset import RAW_DATASET_DIR, RAW_SCHEMA, READ_CHUNK_ROWS, iter_raw_csv, iter_raw_dataset
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# True = hasil pembersihan identik dengan clean_text (stopword Sastrawi ada yang terlewat)
+CLEAN_EXACT_COMPAT = False
+RAW_CSV_PATTERN = 'data/raw/*.csv'
+DERIVED_COLUMNS = ['content_hash', 'cleaned_full_text', 'formatted_date']
+
+
+def raw_inputs():
+    """Sumber data mentah: dataset Parquet terpartisi + CSV lama di data/raw jika masih ada."""
+    inputs = []
+    if os.path.isdir(RAW_DATASET_DIR):
+        inputs.append((f"dataset '{RAW_DATASET_DIR}'", RAW_SCHEMA.names))
+    for path in sorted(glob.glob(RAW_CSV_PATTERN)):
+        inputs.append((path, list(pd.read_csv(path, nrows=0).columns)))
+    return inputs
+
+
+def iter_raw_chunks(chunk_rows):
+    """(nama sumber, DataFrame bertipe) per potongan, tanpa pernah memuat semua data sekaligus."""
+    for chunk in iter_raw_dataset(RAW_DATASET_DIR, chunk_rows):
+        yield f"dataset '{RAW_DATASET_DIR}'", chunk
+    for path in sorted(glob.glob(RAW_CSV_PATTERN)):
+        for chunk in iter_raw_csv(path, chunk_rows):
+            yield path, chunk
+
+
+def output_columns(inputs, existing=None):
+    """Urutan kolom master: header master lama (jika ada) lalu kolom baru dari input."""
+    columns = list(existing or [])
+    for _, names in inputs:
+        columns += [name for name in names if name not in columns]
+    if 'title' not in columns:
+        columns.append('title')
+    return columns + [name for name in DERIVED_COLUMNS if name not in columns]
+
+
+def preprocess_chunk(df, seen_hashes, seen_texts, near_index, rejected, pool, args, stats):
+    """
+    Dedup (terhadap state lintas potongan), pembersihan teks, format tanggal,
+    dan near-dedup untuk satu potongan (`pool` dari make_pool dipakai ulang
+    untuk semua potongan). `seen_hashes`/`seen_texts` diperbarui;
+    content_hash baris yang dibuang karena datanya tidak lengkap masuk `rejected`.
+    """
+    stats['read'] += len(df)
+    df['content_hash'] = content_hashes(df)
+    full_text_hashes = pd.Series(text_hashes(df['full_text']), index=df.index, dtype=object)
+
+    # Hapus data yang sudah diproses dan duplikat teks lengkap (di potongan ini maupun sebelumnya)
+    known = df['content_hash'].isin(seen_hashes) | full_text_hashes.isin(seen_texts)
+    keep = ~known & ~full_text_hashes.duplicated(keep='first')
+    stats['duplicates'] += int((~keep).sum())
+    df = df[keep].copy()
+    seen_hashes.update(df['content_hash'])
+    seen_texts.update(full_text_hashes[keep].dropna())
+    if df.empty:
+        return df
+
+    # Standarisasi kolom
+    if 'title' not in df.columns:
+        df['title'] = df['full_text'].str[:70] + '...'
+    df['title'] = df['title'].fillna(df['full_text'].str[:70] + '...')
+
+    started = time.perf_counter()
+    dates = df['publish_date'] if 'publish_date' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    df['cleaned_full_text'], df['formatted_date'] = preprocess_columns(
+        df['full_text'], dates, df.get('crawled_at'), workers=args.workers, exact=CLEAN_EXACT_COMPAT, pool=pool
+    )
+    stats['seconds'] += time.perf_counter() - started
+
+    # Hapus baris yang datanya tidak lengkap setelah diproses; hash-nya dicatat
+    # agar tidak dibersihkan ulang setiap run inkremental
+    incomplete = df['formatted_date'].isna() | df['full_text'].isna()
+    rejected.update(df.loc[incomplete, 'content_hash'])
+    stats['rejected'] += int(incomplete.sum())
+    df = df[~incomplete]
+
+    # Near-duplicate (sindikasi, spam copy-paste) dibuang sebelum masuk master,
+    # dicek terhadap index data lama dan baris sebelumnya
+    if near_index is not None and not df.empty:
+        duplicate_of = find_near_duplicates(df['cleaned_full_text'], df['content_hash'], near_index)
+        is_duplicate = pd.Series(duplicate_of, index=df.index).notna()
+        stats['near_duplicates'] += int(is_duplicate.sum())
+        df = df[~is_duplicate]
+    return df
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Stasiun preprocessing: pembersihan teks dan format tanggal.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"Jumlah proses (mis. {DEFAULT_WORKERS}); serial bila potongan < {PARALLEL_MIN_ROWS} baris.")
+    parser.add_argument("--chunk-size", type=int, default=READ_CHUNK_ROWS,
+                        help="Baris per potongan; memori sebanding ukuran potongan, bukan ukuran korpus.")
+    parser.add_argument("--full", action="store_true",
+                        help="Bangun ulang dataset master dari awal (abaikan data yang sudah diproses).")
+    parser.add_argument("--no-near-dedup", action="store_true",
+                        help=f"Lewati deteksi near-duplicate (MinHash/LSH, Jaccard >= {NEAR_DUP_THRESHOLD}).")
+    args = parser.parse_args()
+
     print("======================================================")
     print("🧹 MEMULAI STASIUN 2: PREPROCESSING (BERITA + YOUTUBE) 🧹")
     print("======================================================")
-    
-    # Gabungkan SEMUA file .csv dari folder data/raw
-    all_raw_files = glob.glob('data/raw/*.csv')
-    
-    if not all_raw_files:
-        print("[ERROR] Tidak ada file data mentah di 'data/raw/'. Jalankan script crawling terlebih dahulu.")
+
+    inputs = raw_inputs()
+    if not inputs:
+        print("[ERROR] Tidak ada data mentah di 'data/raw/'. Jalankan script crawling terlebih dahulu.")
         return
 
-    df_list = []
-    for f in all_raw_files:
-        print(f"[INFO] Membaca data dari '{f}'...")
-        df_list.append(pd.read_csv(f))
+    # Rebuild penuh jika diminta, master belum ada, aturan cleaner berubah, atau
+    # dataset mentah ditulis ulang (mis. full_text hasil src.crawlers.reextract)
+    config = {'cleaner_version': CLEANER_VERSION, 'exact_compat': CLEAN_EXACT_COMPAT}
+    state = load_state()
+    rebuild_reason = state.pop('rebuild_reason', None)
+    known = None if args.full else load_known(MASTER_PATH)
+    if known is not None and any(state.get(key) != value for key, value in config.items()):
+        print(f"[INFO] Versi cleaner berubah ({state.get('cleaner_version')} -> {CLEANER_VERSION}). "
+              "Dataset master dibangun ulang.")
+        known = None
+    if known is not None and rebuild_reason:
+        print(f"[INFO] Dataset mentah berubah ({rebuild_reason}). Dataset master dibangun ulang.")
+        known = None
+    seen_hashes, seen_texts = known if known is not None else (set(), set())
+    master_hashes = set(seen_hashes)
+    # Record yang ditolak cleaner versi ini pada run sebelumnya tidak diproses ulang
+    rejected = load_rejected(CLEANER_VERSION) if known is not None else set()
+    seen_hashes |= rejected
 
-    df = pd.concat(df_list, ignore_index=True)
-    
-    # Hapus duplikat berdasarkan teks lengkap untuk mencegah data ganda
-    df.drop_duplicates(subset=['full_text'], inplace=True, keep='first')
-    print(f"\n[INFO] Total {len(df)} data unik digabungkan.")
+    near_index = None
+    if not args.no_near_dedup:
+        near_index = NearDuplicateIndex(load=known is not None)
+        # Index belum ada, parameternya berubah, atau tertinggal dari master
+        # (run dengan --no-near-dedup): lengkapi dari master
+        missing = master_hashes - set(near_index.keys) - near_index.empty_keys
+        if missing:
+            print(f"[INFO] Menambahkan {len(missing)} dokumen master ke index near-duplicate...")
+            for chunk in iter_master(MASTER_PATH, columns=['content_hash', 'cleaned_full_text']):
+                for key, text in zip(chunk['content_hash'], chunk['cleaned_full_text']):
+                    if key in missing:
+                        near_index.add(key, text)
+        seen_hashes |= near_index.dropped
 
-    # Standarisasi kolom
-    print("[INFO] Memulai pembersihan teks dan format tanggal...")
-    if 'title' not in df.columns:
-        df['title'] = df['full_text'].str[:70] + '...'
-    df['title'].fillna(df['full_text'].str[:70] + '...', inplace=True)
-    
-    df['cleaned_full_text'] = df['full_text'].apply(clean_text)
-    df['formatted_date'] = df['publish_date'].apply(format_date)
-    
-    # Hapus baris yang datanya tidak lengkap setelah diproses
-    df.dropna(subset=['formatted_date', 'full_text'], inplace=True)
-
-    output_path = 'data/processed/master_cleaned_data.csv'
-    df.to_csv(output_path, index=False)
-    
-    print(f"\n[SUCCESS] Dataset master bersih dengan {len(df)} baris data disimpan ke '{output_path}'.")
+    if known is not None:
+        print(f"[INFO] Mode inkremental: {len(seen_hashes)} record sudah diproses sebelumnya.")
+    columns = output_columns(inputs, master_columns(MASTER_PATH) if known is not None else None)
+    writer = MasterWriter(columns, MASTER_PATH, rebuild=known is None)
+    # Token cleaned_full_text (kosakata + matriks CSR) untuk frekuensi kata & word cloud
+    token_writer = TokenMatrixWriter(TOKEN_MATRIX_DIR, rebuild=known is None)
+    if known is not None and token_writer.empty:
+        print("[INFO] Membuat matriks token untuk dataset master yang sudah ada...")
+        for chunk in iter_master(MASTER_PATH, columns=['content_hash', 'cleaned_full_text']):
+            token_writer.write(chunk['content_hash'], chunk['cleaned_full_text'])
+
+    print(f"[INFO] Memulai pembersihan teks dan format tanggal (potongan {args.chunk_size} baris)...")
+    stats = {'read': 0, 'duplicates': 0, 'near_duplicates': 0, 'rejected': 0, 'seconds': 0.0}
+    # Satu process pool untuk seluruh run: worker (dan stopword/stemmer-nya) dibuat sekali
+    pool = make_pool(args.workers)
+    try:
+        for source_name, chunk in iter_raw_chunks(args.chunk_size):
+            processed = preprocess_chunk(chunk, seen_hashes, seen_texts, near_index, rejected, pool, args, stats)
+            if not processed.empty:
+                writer.write(processed)
+                token_writer.write(processed['content_hash'], processed['cleaned_full_text'])
+            print(f"[INFO] {source_name}: {len(chunk)} baris dibaca, {len(processed)} baris baru ditulis.")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    writer.close()
+    token_writer.close()
+
+    print(f"\n[INFO] {stats['read']} record dibaca; {stats['duplicates']} sudah diproses/duplikat, "
+          f"{stats['near_duplicates']} near-duplicate dibuang, {stats['rejected']} ditolak (tanggal/teks kosong).")
+    print(f"[INFO] Pembersihan & format tanggal: {stats['seconds']:.1f} detik ({args.workers} worker).")
+    if resource is not None:
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"[INFO] Puncak memori: {peak_mb:.0f} MB.")
+
+    if known is not None:
+        print(f"\n[SUCCESS] {writer.count} baris baru ditambahkan ke '{MASTER_PATH}'.")
+    else:
+        print(f"\n[SUCCESS] Dataset master bersih dengan {writer.count} baris data disimpan ke '{MASTER_PATH}'.")
+    if near_index is not None:
+        near_index.save()
+    save_rejected(rejected, CLEANER_VERSION)
+    save_state(dict(state, **config))
     print("\n✅ Stasiun Preprocessing Selesai.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -9,14 +9,21 @@ matplotlib.use('Agg') # <-- BARIS PENTING 1: Set backend SEBELUM pyplot di-impor
 import matplotlib.pyplot as plt # <-- BARIS PENTING 2: Import pyplot SETELAH backend di-set
 # =========================================================
 
-def calculate_word_frequency(series_text):
+def calculate_word_frequency(series_text, matrix=None, keys=None, top_n=15):
     """
     Menghitung frekuensi setiap kata dari sebuah Series pandas.
+    Jika `matrix` (TokenMatrix hasil preprocessing) dan `keys` (content_hash
+    baris yang sama) diberikan, frekuensi diambil dari matriks token tanpa
+    memecah ulang teks.
     """
+    if matrix is not None and keys is not None:
+        rows = matrix.rows_for(keys)
+        if len(rows) == len(keys):
+            return matrix.top_terms(top_n, rows)
     full_text = ' '.join(series_text.dropna())
     words = full_text.split()
     word_counts = Counter(words)
-    return word_counts.most_common(15)
+    return word_counts.most_common(top_n)
 
 def plot_top_words(word_counts, save_path):
     """
@@ -1,39 +1,207 @@
 # src/crawlers/base_crawler.py
 
+import asyncio
+import time
+from urllib.parse import urlsplit
+
 import httpx
-from bs4 import BeautifulSoup
 
-# Client httpx global yang akan digunakan oleh crawler yang aktif
-CLIENT = httpx.AsyncClient(
-    follow_redirects=True, 
-    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 1.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'},
-    timeout=30.0
+from .concurrency import (
+    FetchFailure, MAX_RETRIES, RETRYABLE_STATUS, backoff_delay, retry_after_seconds
 )
+from .extraction import extract_full_text, extraction_version
+from .http_cache import HttpCache
+from .parsing import run_parser
+
+# --- Pengaturan rate limit per host ---
+RATE_LIMIT_PER_SEC = 8.0    # rata-rata request per detik ke satu host
+RATE_LIMIT_BURST = 16       # jumlah request yang boleh dikirim sekaligus
+LISTING_CONCURRENCY = 5     # jumlah halaman daftar artikel yang diambil bersamaan
+
+class TokenBucket:
+    """Token bucket sederhana: `rate` token per detik, maksimal `burst` token."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Lock dipegang selama menunggu agar antrean dilayani secara FIFO
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimiter:
+    """Rate limiter per host; setiap host mendapat token bucket sendiri."""
 
-async def get_full_text(url: str, source: str) -> str:
+    def __init__(self, rate: float = RATE_LIMIT_PER_SEC, burst: int = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+
+    async def acquire(self, url: str):
+        host = urlsplit(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+
+# Cache respons artikel di disk (koneksi baru dibuka saat pertama dipakai)
+HTTP_CACHE = HttpCache()
+
+
+async def fetch(session, url: str, source: str = None, **kwargs) -> httpx.Response:
+    """
+    GET lewat client milik `session` (CrawlSession, lihat src/crawlers/session.py)
+    dengan rate limit dan konkurensi adaptif per host. Respons 429/5xx dan
+    timeout dicoba ulang dengan exponential backoff (menghormati Retry-After);
+    jika tetap gagal, server membalas 4xx lain, atau request gagal karena hal
+    yang tidak akan berubah bila diulang (mis. TooManyRedirects, DecodingError),
+    FetchFailure dilempar.
+    Setiap percobaan dicatat ke `session.metrics` dengan label `source` (default: host).
+    """
+    label = source or urlsplit(url).netloc.lower()
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
+        async with session.concurrency.slot(url) as slot:
+            await session.limiter.acquire(url)
+            started = time.monotonic()
+            try:
+                response = await session.client.get(url, **kwargs)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                slot.overloaded()
+                session.metrics.record_request(label, time.monotonic() - started, type(e).__name__, attempt=attempt)
+                reason, status = f"{type(e).__name__}: {e}", None
+            except httpx.RequestError as e:
+                # Kesalahan lain (redirect berlebihan, decoding, URL tidak valid) tidak dicoba ulang
+                session.metrics.record_request(label, time.monotonic() - started, type(e).__name__, attempt=attempt)
+                session.metrics.record_failure(label)
+                raise FetchFailure(url, f"{type(e).__name__}: {e}", None, attempt + 1) from e
+            else:
+                latency = time.monotonic() - started
+                session.metrics.record_request(label, latency, response.status_code, len(response.content), attempt)
+                if response.status_code in RETRYABLE_STATUS:
+                    slot.overloaded()
+                    reason, status = f"HTTP {response.status_code}", response.status_code
+                    retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                elif response.is_error:
+                    slot.succeeded(latency)
+                    session.metrics.record_failure(label)
+                    raise FetchFailure(url, f"HTTP {response.status_code}", response.status_code, attempt + 1)
+                else:
+                    slot.succeeded(latency)
+                    return response
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+    session.metrics.record_failure(label)
+    raise FetchFailure(url, reason, status, MAX_RETRIES + 1)
+
+
+async def crawl_listing_pages(fetch_page, total_pages: int, concurrency: int = LISTING_CONCURRENCY, seen=None, queue=None):
+    """
+    Mengambil halaman daftar artikel 1..total_pages secara bersamaan (per jendela
+    `concurrency` halaman). `fetch_page(page)` mengembalikan list item, atau None
+    jika gagal. Pagination berhenti pada halaman pertama yang kosong.
+
+    Tanpa `queue`, semua item dikumpulkan dan dikembalikan sebagai list. Dengan
+    `queue` (asyncio.Queue), item langsung dimasukkan ke antrean begitu halamannya
+    selesai diproses dan fungsi mengembalikan jumlah item.
+
+    Jika `seen` (SeenUrlIndex) diberikan, artikel yang sudah dikenal dilewati dan
+    pagination berhenti pada halaman yang seluruh isinya sudah dikenal. Karena
+    daftar diurutkan dari yang terbaru, jendela dimulai dari 1 halaman dan baru
+    diperbesar selama halaman masih berisi artikel baru.
+    """
+    results = []
+    count = 0
+    window = 1 if seen else concurrency
+    start = 1
+    while start <= total_pages:
+        pages = range(start, min(start + window, total_pages + 1))
+        batch = await asyncio.gather(*(fetch_page(page) for page in pages))
+        for page, items in zip(pages, batch):
+            if items is None:
+                continue
+            if not items:
+                print(f"  - Halaman {page} kosong, pagination dihentikan.")
+                return count if queue is not None else results
+            if seen is not None:
+                new_items = [item for item in items if item['url'] not in seen]
+                if not new_items:
+                    print(f"  - Semua artikel di halaman {page} sudah dikenal, pagination dihentikan.")
+                    return count if queue is not None else results
+                items = new_items
+            count += len(items)
+            if queue is not None:
+                for item in items:
+                    await queue.put(item)
+            else:
+                results.extend(items)
+        start += window
+        window = min(window * 2, concurrency)
+    return count if queue is not None else results
+
+
+async def get_full_text(session, url: str, source: str) -> str:
     """
     Fungsi asinkron untuk mengambil teks lengkap dari URL artikel.
-    Logika untuk Bola.net sudah dihapus.
+    Respons disimpan di HTTP_CACHE: entri yang masih segar dipakai langsung,
+    entri lama direvalidasi dengan If-None-Match/If-Modified-Since. Teks
+    cache dari versi ekstraksi lain (SourceSpec berubah) diekstrak ulang dari
+    body cache tanpa request selama body masih segar.
+    Kegagalan jaringan/HTTP dilempar sebagai FetchFailure. Jika sesi punya
+    arsip HTML, setiap body baru juga diarsipkan untuk ekstraksi ulang.
     """
-    try:
-        response = await CLIENT.get(url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        if source == 'detik':
-            body = soup.find('div', class_='detail__body-text')
-            if body: 
-                return ' '.join([p.get_text(strip=True) for p in body.find_all('p')])
-        
-        elif source == 'kompas':
-            body = soup.find('div', class_='read__content')
-            if body:
-                for unwanted in body.select('.read__also, .ads-on-body, script, style, .kgnw-middle, .kompasidRec, .banner-300, .photo, .video, .twitter-tweet, iframe'):
-                    unwanted.decompose()
-                return body.get_text(strip=True, separator=' ')
-
-        # Jika sumber tidak dikenal atau gagal, kembalikan pesan ini
-        return "Teks lengkap tidak ditemukan."
-    except Exception as e:
-        print(f"   - Terjadi error saat memproses {url}: {e}")
-        return f"Error: {e}"
\ No newline at end of file
+    metrics = session.metrics
+    extractor = extraction_version(source)
+    cached = HTTP_CACHE.get(url, extractor)
+    if cached and cached.is_fresh(HTTP_CACHE.ttl):
+        metrics.record_cache_hit(source)
+        return cached.text
+
+    response = None
+    if cached and cached.stale_extraction and cached.is_recent(HTTP_CACHE.ttl):
+        metrics.record_cache_hit(source)
+        html = cached.body
+    else:
+        headers = cached.conditional_headers() if cached else {}
+        response = await fetch(session, url, source=source, timeout=15, headers=headers)
+        if response.status_code == 304 and cached:
+            HTTP_CACHE.refresh(url)
+            metrics.record_cache_hit(source)
+            if cached.text is not None:
+                return cached.text
+            html = cached.body
+        else:
+            html = response.text
+
+    started = time.monotonic()
+    text = await run_parser(extract_full_text, html, source)
+    metrics.record_parse(source, time.monotonic() - started)
+    metrics.record_extraction(source, text is not None)
+    if response is not None and response.status_code != 304:
+        if session.archive is not None:
+            session.archive.add(url, source, response.text)
+        HTTP_CACHE.put(
+            url, response.text, text,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            extractor=extractor,
+        )
+    else:
+        # Body dari cache diekstrak ulang: simpan teks dengan versi ekstraksi sekarang
+        HTTP_CACHE.set_text(url, text, extractor)
+
+    # Jika sumber tidak dikenal atau gagal, kembalikan pesan ini
+    return text if text is not None else "Teks lengkap tidak ditemukan."
@@ -2,11 +2,11 @@
 
 import asyncio
 
-async def crawl_bola(total_pages: int):
+async def crawl_bola(session, total_pages: int, seen=None, queue=None):
     """
     Crawler Bola.net dinonaktifkan karena masalah teknis.
     Fungsi ini sekarang hanya mengembalikan list kosong.
     """
     print("\n[INFO] Crawling Bola.net dinonaktifkan.")
-    # Kembalikan list kosong agar tidak error di pipeline utama
-    return []
\ No newline at end of file
+    # Kembalikan hasil kosong agar tidak error di pipeline utama
+    return 0 if queue is not None else []
\ No newline at end of file
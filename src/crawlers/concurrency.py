@@ -0,0 +1,142 @@
+# src/crawlers/concurrency.py
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# --- Pengaturan konkurensi adaptif (AIMD) per host ---
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+LATENCY_TARGET = 3.0        # detik; di atas ini konkurensi tidak dinaikkan
+
+# --- Pengaturan retry ---
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0          # detik, dikalikan 2^percobaan
+BACKOFF_MAX = 60.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchFailure(Exception):
+    """Kegagalan mengambil URL yang dicatat secara terstruktur, bukan sebagai teks artikel."""
+
+    def __init__(self, url: str, reason: str, status: int = None, attempts: int = 1):
+        super().__init__(f"{reason} ({url})")
+        self.url = url
+        self.reason = reason
+        self.status = status
+        self.attempts = attempts
+
+    def to_record(self) -> dict:
+        return {
+            'url': self.url,
+            'status': self.status,
+            'reason': self.reason,
+            'attempts': self.attempts,
+            'failed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+
+class _HostState:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.successes = 0
+        self.last_decrease = 0.0
+        self.cond = asyncio.Condition()
+
+
+class AdaptiveConcurrency:
+    """
+    Pembatas konkurensi per host dengan pola AIMD: batas naik +1 setelah satu
+    "putaran" request sukses dengan latensi sehat, dan turun setengah saat host
+    membalas 429/5xx atau timeout.
+    """
+
+    def __init__(self, initial: int = INITIAL_CONCURRENCY, minimum: int = MIN_CONCURRENCY,
+                 maximum: int = MAX_CONCURRENCY, latency_target: float = LATENCY_TARGET):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self._hosts = {}
+
+    def _state(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc.lower()
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial)
+        return state
+
+    def limit_for(self, url: str) -> int:
+        return int(self._state(url).limit)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Menunggu slot kosong untuk host `url`; hasil dilaporkan lewat objek yang di-yield."""
+        state = self._state(url)
+        async with state.cond:
+            await state.cond.wait_for(lambda: state.in_flight < int(state.limit))
+            state.in_flight += 1
+        outcome = _SlotOutcome(self, state)
+        try:
+            yield outcome
+        finally:
+            async with state.cond:
+                state.in_flight -= 1
+                state.cond.notify_all()
+
+    def _on_success(self, state: _HostState, latency: float):
+        if latency > self.latency_target:
+            state.successes = 0
+            return
+        state.successes += 1
+        if state.successes >= state.limit and state.limit < self.maximum:
+            state.limit += 1
+            state.successes = 0
+
+    def _on_overload(self, state: _HostState):
+        # Request yang sudah berjalan sebelum penurunan terakhir tidak menurunkan batas lagi
+        now = time.monotonic()
+        state.successes = 0
+        if now - state.last_decrease < 1.0:
+            return
+        state.last_decrease = now
+        state.limit = max(self.minimum, state.limit / 2)
+
+
+class _SlotOutcome:
+    def __init__(self, controller: AdaptiveConcurrency, state: _HostState):
+        self._controller = controller
+        self._state = state
+
+    def succeeded(self, latency: float):
+        self._controller._on_success(self._state, latency)
+
+    def overloaded(self):
+        self._controller._on_overload(self._state)
+
+
+def retry_after_seconds(value):
+    """Membaca header Retry-After (detik atau tanggal HTTP); None jika tidak valid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after=None) -> float:
+    """Exponential backoff dengan jitter; Retry-After dari server selalu dihormati."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    delay = random.uniform(delay / 2, delay)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, BACKOFF_MAX * 5))
+    return delay
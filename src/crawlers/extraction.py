@@ -0,0 +1,219 @@
+# src/crawlers/extraction.py
+
+import hashlib
+import re
+
+import soupsieve
+from bs4 import SoupStrainer
+
+from .parsing import HTML_PARSER, make_soup
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-z0-9]+)\.([\w-]+)$')
+# Naikkan jika logika engine ekstraksi teks berubah (perubahan selector SourceSpec
+# sudah otomatis mengubah extraction_version sumbernya)
+EXTRACTION_ENGINE_VERSION = 1
+
+
+def _strainer_for(selector: str):
+    """SoupStrainer untuk selector sederhana 'tag.kelas'; None jika tidak bisa dibatasi."""
+    match = _SIMPLE_SELECTOR.match(selector)
+    if not match:
+        return None
+    wanted = match.group(2)
+
+    # Saat parsing, atribut class bisa masih berupa string mentah ("a b"), jadi
+    # dicocokkan per kata agar elemen dengan beberapa kelas tetap ikut
+    def has_class(value):
+        if not value:
+            return False
+        return wanted in (value.split() if isinstance(value, str) else value)
+
+    return SoupStrainer(match.group(1), class_=has_class)
+
+
+class SourceSpec:
+    """
+    Spesifikasi ekstraksi satu sumber berita. Semua selector berupa string CSS
+    dan dikompilasi sekali saat spesifikasi dibuat.
+
+    - listing_item: selector setiap kartu artikel di halaman daftar
+    - listing_fields: {kolom: selector} atau {kolom: (selector, atribut)} di dalam kartu
+    - listing_constants: kolom bernilai tetap (mis. 'author')
+    - body: selector kontainer teks artikel
+    - body_text: jika diisi, teks diambil dari elemen ini saja (mis. 'p') lalu digabung
+    - remove: selector elemen yang dibuang dari body sebelum teks diambil
+    - date: selector tanggal terbit di halaman artikel
+    """
+
+    def __init__(self, name, listing_item, listing_fields, body, listing_constants=None,
+                 body_text=None, remove=None, date=None):
+        self.name = name
+        self.listing_item = listing_item
+        self.listing_fields = {
+            field: (rule, None) if isinstance(rule, str) else tuple(rule)
+            for field, rule in listing_fields.items()
+        }
+        self.listing_constants = dict(listing_constants or {})
+        self.body = body
+        self.body_text = body_text
+        self.remove = remove
+        self.date = date
+
+        # Versi terkompilasi untuk backend BeautifulSoup
+        self._listing_item = soupsieve.compile(listing_item)
+        self._listing_fields = {
+            field: (soupsieve.compile(selector), attr)
+            for field, (selector, attr) in self.listing_fields.items()
+        }
+        self._body = soupsieve.compile(body)
+        self._body_text = soupsieve.compile(body_text) if body_text else None
+        self._remove = soupsieve.compile(remove) if remove else None
+        self._date = soupsieve.compile(date) if date else None
+        self.listing_strainer = _strainer_for(listing_item)
+        self.body_strainer = _strainer_for(body)
+        self.date_strainer = _strainer_for(date) if date else None
+        # Sidik aturan ekstraksi teks, disimpan bersama teks di cache HTTP
+        rules = '\x1f'.join([str(EXTRACTION_ENGINE_VERSION), body, body_text or '', remove or ''])
+        self.extraction_version = hashlib.blake2b(rules.encode('utf-8'), digest_size=8).hexdigest()
+
+
+SOURCES = {}
+
+
+def register_source(spec: SourceSpec):
+    """Mendaftarkan sumber baru; crawler dan get_full_text memakainya lewat nama."""
+    SOURCES[spec.name] = spec
+    return spec
+
+
+register_source(SourceSpec(
+    name='detik',
+    listing_item='article.list-content__item',
+    listing_fields={
+        'title': 'h3.media__title',
+        'url': ('h3.media__title a', 'href'),
+        'publish_date': 'div.media__date',
+        'source': 'h2.media__subtitle',
+    },
+    listing_constants={'author': 'Detik.com'},
+    body='div.detail__body-text',
+    body_text='p',
+    date='div.detail__date',
+))
+
+register_source(SourceSpec(
+    name='kompas',
+    listing_item='div.articleItem',
+    listing_fields={
+        'title': 'h2.articleTitle',
+        'url': ('a.article-link', 'href'),
+        'publish_date': 'div.articlePost-date',
+    },
+    listing_constants={'source': 'Kompas.com', 'author': 'Kompas.com'},
+    body='div.read__content',
+    remove='.read__also, .ads-on-body, script, style, .kgnw-middle, .kompasidRec, .banner-300, .photo, .video, .twitter-tweet, iframe',
+    date='div.read__time',
+))
+
+
+def extraction_version(source: str) -> str:
+    """Versi aturan ekstraksi teks `source`; teks hasil versi lain tidak boleh dipakai ulang."""
+    spec = SOURCES.get(source)
+    return spec.extraction_version if spec is not None else f'engine-{EXTRACTION_ENGINE_VERSION}'
+
+
+# --- Engine ekstraksi ---
+
+def parse_listing(html: str, source: str, backend: str = None):
+    """Mengurai halaman daftar artikel menjadi list metadata; kartu tanpa kolom lengkap dilewati."""
+    spec = SOURCES[source]
+    if (backend or HTML_PARSER) == 'selectolax':
+        return _parse_listing_selectolax(spec, html)
+
+    soup = make_soup(html, parse_only=spec.listing_strainer, backend=backend)
+    items = []
+    for card in spec._listing_item.select(soup):
+        item = {}
+        for field, (selector, attr) in spec._listing_fields.items():
+            node = selector.select_one(card)
+            value = None if node is None else (node.get(attr) if attr else node.get_text(strip=True))
+            if not value:
+                break
+            item[field] = value
+        else:
+            item.update(spec.listing_constants)
+            item['crawler'] = spec.name
+            items.append(item)
+    return items
+
+
+def extract_full_text(html: str, source: str, backend: str = None):
+    """Mengekstrak teks artikel dari HTML; mengembalikan None jika tidak ditemukan."""
+    spec = SOURCES.get(source)
+    if spec is None:
+        return None
+    if (backend or HTML_PARSER) == 'selectolax':
+        return _extract_selectolax(spec, html)
+
+    soup = make_soup(html, parse_only=spec.body_strainer, backend=backend)
+    body = spec._body.select_one(soup)
+    if body is None:
+        return None
+    if spec._remove is not None:
+        for unwanted in spec._remove.select(body):
+            unwanted.decompose()
+    if spec._body_text is not None:
+        return ' '.join([node.get_text(strip=True) for node in spec._body_text.select(body)])
+    return body.get_text(strip=True, separator=' ')
+
+
+def extract_publish_date(html: str, source: str, backend: str = None):
+    """Mengambil teks tanggal terbit dari halaman artikel (jika sumber punya selector tanggal)."""
+    spec = SOURCES.get(source)
+    if spec is None or spec._date is None:
+        return None
+    soup = make_soup(html, parse_only=spec.date_strainer, backend=backend)
+    node = spec._date.select_one(soup)
+    return node.get_text(strip=True) if node else None
+
+
+# --- Backend selectolax ---
+
+def _selectolax_tree(html: str):
+    from selectolax.lexbor import LexborHTMLParser
+    return LexborHTMLParser(html)
+
+
+def _selectolax_text(node) -> str:
+    # Setara get_text(strip=True, separator=' ') milik BeautifulSoup
+    texts = (child.text_content.strip() for child in node.traverse(include_text=True) if child.tag == '-text')
+    return ' '.join(t for t in texts if t)
+
+
+def _parse_listing_selectolax(spec: SourceSpec, html: str):
+    items = []
+    for card in _selectolax_tree(html).css(spec.listing_item):
+        item = {}
+        for field, (selector, attr) in spec.listing_fields.items():
+            node = card.css_first(selector)
+            value = None if node is None else (node.attributes.get(attr) if attr else node.text(strip=True))
+            if not value:
+                break
+            item[field] = value
+        else:
+            item.update(spec.listing_constants)
+            item['crawler'] = spec.name
+            items.append(item)
+    return items
+
+
+def _extract_selectolax(spec: SourceSpec, html: str):
+    body = _selectolax_tree(html).css_first(spec.body)
+    if body is None:
+        return None
+    if spec.remove:
+        for unwanted in body.css(spec.remove):
+            unwanted.decompose()
+    if spec.body_text:
+        return ' '.join([node.text(strip=True) for node in body.css(spec.body_text)])
+    return _selectolax_text(body)
@@ -7,12 +7,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import time
 import os
+import time
 from dotenv import load_dotenv
 
+from .facebook_posts import extract_posts
+
 # Muat variabel dari file .env
 load_dotenv()
 
@@ -68,59 +70,126 @@ def login_to_facebook(driver):
         print(f"[ERROR] Gagal login ke Facebook: {e}")
         return False
 
-def crawl_facebook(target_id, scroll_count=3):
+# --- Pengaturan scroll ---
+SCROLL_WAIT_TIMEOUT = 10    # detik maksimal menunggu postingan baru setelah satu scroll
+SCROLL_POLL_INTERVAL = 0.3  # interval pengecekan jumlah postingan
+MAX_IDLE_SCROLLS = 2        # berhenti jika sekian scroll berturut-turut tidak menambah postingan
+SETTLE_SECONDS = 1.0        # jeda sebelum pengambilan terakhir (tanpa scroll)
+
+# Mengambil outerHTML postingan yang belum pernah diproses lalu menandainya,
+# sehingga setiap langkah hanya menyerialisasi node yang baru muncul. Node baru
+# ditandai setelah teksnya stabil: tombol "See more" diklik dulu, dan panjang
+# teks harus sama dengan langkah sebelumnya (postingan yang masih lazy-load
+# diambil pada langkah berikutnya). `arguments[0]` = langkah terakhir, semua
+# node yang tersisa diambil apa adanya.
+_TAKE_NEW_ARTICLES_JS = """
+const final = arguments[0];
+const expander = /^(see more|lihat selengkapnya)$/i;
+const taken = [];
+for (const node of document.querySelectorAll('div[role="article"]:not([data-crawled])')) {
+  const buttons = Array.from(node.querySelectorAll('[role="button"]'))
+    .filter(button => expander.test(button.textContent.trim()));
+  if (buttons.length && !final) {
+    buttons.forEach(button => button.click());
+    delete node.dataset.crawlLength;
+    continue;
+  }
+  const length = String(node.textContent.length);
+  if (!final && node.dataset.crawlLength !== length) {
+    node.dataset.crawlLength = length;
+    continue;
+  }
+  node.setAttribute('data-crawled', '1');
+  taken.push(node.outerHTML);
+}
+return taken;
+"""
+_COUNT_ARTICLES_JS = "return document.querySelectorAll('div[role=\"article\"]').length;"
+
+
+def _article_count(driver):
+    return driver.execute_script(_COUNT_ARTICLES_JS)
+
+
+def _wait_for_new_articles(driver, previous_count, timeout=SCROLL_WAIT_TIMEOUT):
+    """Menunggu sampai jumlah postingan bertambah; False jika tidak bertambah sampai timeout."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=SCROLL_POLL_INTERVAL).until(
+            lambda d: _article_count(d) > previous_count
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def iter_facebook_posts(driver, target_id, scroll_count=3, snapshot_dir=None):
+    """
+    Generator postingan relevan dari halaman target secara bertahap: setiap
+    langkah scroll hanya mengekstrak `div[role="article"]` baru yang teksnya
+    sudah stabil (lihat _TAKE_NEW_ARTICLES_JS), dedup berdasarkan URL
+    postingan, lalu langsung di-yield. Scroll berhenti lebih awal jika jumlah
+    postingan tidak lagi bertambah; sisa postingan diambil pada langkah terakhir.
+    """
+    target_url = f"https://www.facebook.com/{target_id}"
+    print(f"\n[INFO] Mengunjungi halaman target: {target_url}")
+    driver.get(target_url)
+    WebDriverWait(driver, SCROLL_WAIT_TIMEOUT).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, 'div[role="article"]'))
+    )
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+
+    seen = set()
+    idle_scrolls = 0
+    print(f"[INFO] Mulai scroll halaman maksimal {scroll_count} kali...")
+    for step in range(scroll_count + 2):
+        final = step == scroll_count + 1 or idle_scrolls >= MAX_IDLE_SCROLLS
+        fragments = driver.execute_script(_TAKE_NEW_ARTICLES_JS, final)
+        if fragments:
+            html = '\n'.join(fragments)
+            if snapshot_dir:
+                with open(os.path.join(snapshot_dir, f'step_{step:03d}.html'), 'w', encoding='utf-8') as f:
+                    f.write(html)
+            yield from extract_posts(html, target_id, seen)
+
+        if final:
+            break
+        if step == scroll_count:
+            # Tanpa scroll: beri waktu postingan terakhir selesai dimuat/dibuka
+            time.sleep(SETTLE_SECONDS)
+            continue
+        count = _article_count(driver)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        if _wait_for_new_articles(driver, count):
+            idle_scrolls = 0
+        else:
+            idle_scrolls += 1
+            if idle_scrolls >= MAX_IDLE_SCROLLS:
+                print(f"[INFO] Tidak ada postingan baru setelah {step + 1} scroll, berhenti.")
+
+
+def crawl_facebook(target_id, scroll_count=3, sink=None, snapshot_dir=None):
     """
     Mengambil postingan dari halaman Facebook menggunakan Selenium.
+    Jika `sink` (mis. CsvSink) diberikan, postingan langsung ditulis satu per
+    satu dan yang dikembalikan adalah jumlahnya; tanpa `sink` dikembalikan
+    DataFrame. `snapshot_dir` menyimpan HTML tiap langkah scroll untuk diuji
+    ulang secara offline dengan `extract_posts_from_snapshot`.
     """
     driver = get_selenium_driver()
     all_posts_data = []
-    
+    written = 0
+
     try:
         if not login_to_facebook(driver):
             return None # Hentikan jika login gagal
 
-        target_url = f"https://www.facebook.com/{target_id}"
-        print(f"\n[INFO] Mengunjungi halaman target: {target_url}")
-        driver.get(target_url)
-        time.sleep(5) # Beri waktu halaman untuk memuat postingan awal
-
-        print(f"[INFO] Mulai scroll halaman sebanyak {scroll_count} kali...")
-        for _ in range(scroll_count):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3) # Tunggu konten baru dimuat
-
-        # Setelah scroll, ambil HTML halaman dan proses dengan BeautifulSoup
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        
-        # Selector ini lebih umum untuk postingan di timeline
-        posts = soup.select('div[role="article"]')
-        
-        print(f"[INFO] Ditemukan {len(posts)} kontainer postingan. Mulai mengekstrak data...")
-        
-        for post in posts:
-            post_text = post.get_text(separator=' ', strip=True)
-            
-            # Filter postingan yang relevan
-            if 'timnas' in post_text.lower() or 'indonesia' in post_text.lower():
-                # Cari link ke postingan individual (selector ini mungkin perlu disesuaikan)
-                link_tag = post.find('a', href=lambda href: href and '/posts/' in href)
-                post_url = "https://www.facebook.com" + link_tag['href'] if link_tag else target_url
-                
-                # Cari timestamp (selector ini sangat tentatif)
-                time_tag = post.find('a', href=lambda href: href and '/posts/' in href and not href.endswith('/'))
-                post_time_text = time_tag.get_text(strip=True) if time_tag else "Waktu tidak ditemukan"
-                
-                all_posts_data.append({
-                    'source_type': 'facebook',
-                    'source': target_id,
-                    'author': target_id,
-                    'publish_date': post_time_text, # Ini masih format mentah
-                    'full_text': post_text,
-                    'url': post_url,
-                    # Likes/Comments/Shares lebih sulit didapat dengan cara ini, kita set 0
-                    'likes': 0, 'comments': 0, 'shares': 0
-                })
+        for post in iter_facebook_posts(driver, target_id, scroll_count, snapshot_dir):
+            if sink is not None:
+                sink.write(post)
+                written += 1
+            else:
+                all_posts_data.append(post)
 
     except Exception as e:
         print(f"[ERROR] Terjadi kesalahan saat crawling Facebook: {e}")
@@ -128,5 +197,6 @@ def crawl_facebook(target_id, scroll_count=3):
         print("[INFO] Menutup browser Selenium...")
         driver.quit()
 
-    print(f"[SUCCESS] Selesai crawling Facebook, ditemukan {len(all_posts_data)} postingan yang relevan.")
-    return pd.DataFrame(all_posts_data)
\ No newline at end of file
+    total = written if sink is not None else len(all_posts_data)
+    print(f"[SUCCESS] Selesai crawling Facebook, ditemukan {total} postingan yang relevan.")
+    return written if sink is not None else pd.DataFrame(all_posts_data)
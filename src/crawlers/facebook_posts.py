@@ -0,0 +1,91 @@
+# src/crawlers/facebook_posts.py
+#
+# Ekstraksi postingan Facebook dari potongan HTML. Modul ini sengaja tidak
+# bergantung pada Selenium sehingga bisa dijalankan offline terhadap snapshot
+# halaman yang disimpan (lihat `extract_posts_from_snapshot`).
+
+import hashlib
+import os
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from bs4 import SoupStrainer
+
+from .parsing import make_soup
+
+FACEBOOK_BASE_URL = 'https://www.facebook.com'
+POST_KEYWORDS = ('timnas', 'indonesia')
+_ARTICLE_STRAINER = SoupStrainer('div', attrs={'role': 'article'})
+
+
+def _post_link(post):
+    return post.find('a', href=lambda href: href and '/posts/' in href)
+
+
+def canonical_post_url(href: str) -> str:
+    """URL postingan absolut tanpa query/fragment (parameter pelacak berbeda tiap sesi)."""
+    parts = urlsplit(urljoin(FACEBOOK_BASE_URL, href))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), '', ''))
+
+
+def _text_key(text: str) -> str:
+    # Kunci dedup untuk postingan tanpa link: hash teksnya
+    return 'text:' + hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def extract_posts(html: str, target_id: str, seen: set = None):
+    """
+    Mengekstrak postingan relevan dari HTML (satu/lebih `div[role="article"]`
+    atau satu halaman penuh). Postingan yang kuncinya sudah ada di `seen`
+    dilewati, dan kunci postingan baru ditambahkan ke `seen`.
+    """
+    seen = set() if seen is None else seen
+    target_url = f"{FACEBOOK_BASE_URL}/{target_id}"
+    soup = make_soup(html, parse_only=_ARTICLE_STRAINER)
+
+    records = []
+    for post in soup.select('div[role="article"]'):
+        post_text = post.get_text(separator=' ', strip=True)
+
+        # Filter postingan yang relevan
+        lowered = post_text.lower()
+        if not any(keyword in lowered for keyword in POST_KEYWORDS):
+            continue
+
+        link_tag = _post_link(post)
+        # Cari timestamp (selector ini sangat tentatif)
+        time_tag = post.find('a', href=lambda href: href and '/posts/' in href and not href.endswith('/'))
+        record = {
+            'source_type': 'facebook',
+            'source': target_id,
+            'author': target_id,
+            'publish_date': time_tag.get_text(strip=True) if time_tag else "Waktu tidak ditemukan",
+            'full_text': post_text,
+            'url': canonical_post_url(link_tag['href']) if link_tag else target_url,
+            # Likes/Comments/Shares lebih sulit didapat dengan cara ini, kita set 0
+            'likes': 0, 'comments': 0, 'shares': 0,
+        }
+        key = record['url'] if link_tag else _text_key(post_text)
+        if key in seen:
+            continue
+        seen.add(key)
+        records.append(record)
+    return records
+
+
+def extract_posts_from_snapshot(path: str, target_id: str, seen: set = None):
+    """
+    Menjalankan ekstraksi pada snapshot tersimpan: satu file HTML, atau folder
+    berisi `step_*.html` hasil `crawl_facebook(..., snapshot_dir=...)` yang
+    diputar ulang berurutan seperti saat scroll.
+    """
+    seen = set() if seen is None else seen
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.html'))
+    else:
+        paths = [path]
+
+    records = []
+    for snapshot in paths:
+        with open(snapshot, encoding='utf-8') as f:
+            records.extend(extract_posts(f.read(), target_id, seen))
+    return records
@@ -0,0 +1,158 @@
+# src/crawlers/html_archive.py
+#
+# Arsip HTML mentah yang hanya bisa ditambah (append-only), mirip WARC:
+#   data/archive/html/segment-<waktu>.warc.zst   -> record berurutan
+#   data/archive/html/index.sqlite               -> URL -> (segment, offset, length)
+# Setiap record dikompresi sebagai frame zstd tersendiri sehingga bisa dibaca
+# langsung dari offset-nya tanpa membuka seluruh segment.
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+from .http_cache import canonical_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HTML_ARCHIVE_DIR = 'data/archive/html'
+ARCHIVE_SEGMENT_MAX_BYTES = 256 * 1024 * 1024  # segment baru dibuka setelah ukuran ini
+ARCHIVE_COMMIT_EVERY = 100                     # commit index setiap sekian record
+ZSTD_LEVEL = 6                                 # kompromi rasio vs waktu (dijalankan di event loop)
+# Aktifkan pengarsipan saat crawling dengan ARCHIVE_HTML=1
+ARCHIVE_HTML = os.getenv('ARCHIVE_HTML', '0') == '1'
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _warc_record(url: str, source: str, html: str, fetched_at: float) -> bytes:
+    body = html.encode('utf-8')
+    header = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {datetime.fromtimestamp(fetched_at, timezone.utc):%Y-%m-%dT%H:%M:%SZ}\r\n"
+        f"X-Crawler-Source: {source}\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode('utf-8')
+    return header + body + b"\r\n\r\n"
+
+
+def read_record(directory: str, segment: str, offset: int, length: int, codec: str) -> str:
+    """Membaca satu record dari segment dan mengembalikan body HTML-nya."""
+    with open(os.path.join(directory, segment), 'rb') as f:
+        f.seek(offset)
+        raw = _decompress(f.read(length), codec)
+    header, _, body = raw.partition(b"\r\n\r\n")
+    return body[:-4].decode('utf-8')
+
+
+class HtmlArchive:
+    """
+    Penulis dan pembaca arsip HTML mentah. Satu proses crawling menulis ke
+    segment miliknya sendiri; URL yang sama boleh diarsipkan berkali-kali dan
+    index menyimpan semua versinya.
+    """
+
+    def __init__(self, directory: str = HTML_ARCHIVE_DIR, segment_max_bytes: int = ARCHIVE_SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+        self._lock = threading.Lock()
+        self._conn = None
+        self._segment = None
+        self._file = None
+        self._pending = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite'))
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    url TEXT NOT NULL,
+                    source TEXT,
+                    segment TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    codec TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_url ON records (url, fetched_at)")
+        return self._conn
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
+        suffix = 'zst' if self.codec == 'zstd' else 'zz'
+        self._segment = f"segment-{stamp}-{os.getpid()}.warc.{suffix}"
+        self._file = open(os.path.join(self.directory, self._segment), 'ab')
+
+    def add(self, url: str, source: str, html: str, fetched_at: float = None):
+        fetched_at = fetched_at or time.time()
+        data = _compress(_warc_record(url, source, html, fetched_at), self.codec)
+        with self._lock:
+            conn = self._connect()
+            if self._file is None or self._file.tell() >= self.segment_max_bytes:
+                self._open_segment()
+            offset = self._file.tell()
+            self._file.write(data)
+            conn.execute(
+                "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), source, self._segment, offset, len(data), self.codec, fetched_at)
+            )
+            self._pending += 1
+            if self._pending >= ARCHIVE_COMMIT_EVERY:
+                self._flush()
+
+    def _flush(self):
+        # Data segment harus sudah di disk sebelum index yang menunjuk ke sana
+        self._file.flush()
+        self._conn.commit()
+        self._pending = 0
+
+    def latest(self, source: str = None):
+        """Lokasi versi terbaru setiap URL: list (url, source, segment, offset, length, codec, fetched_at)."""
+        query = """
+            SELECT url, source, segment, offset, length, codec, MAX(fetched_at)
+            FROM records {where} GROUP BY url ORDER BY url
+        """
+        where, params = ("WHERE source = ?", (source,)) if source else ("", ())
+        return self._connect().execute(query.format(where=where), params).fetchall()
+
+    def get(self, url: str):
+        """HTML versi terbaru untuk `url`, atau None jika tidak ada di arsip."""
+        row = self._connect().execute(
+            "SELECT segment, offset, length, codec FROM records WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+            (canonical_url(url),)
+        ).fetchone()
+        return read_record(self.directory, *row) if row else None
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,183 @@
+# src/crawlers/http_cache.py
+
+import os
+import sqlite3
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# --- Pengaturan cache respons HTTP ---
+HTTP_CACHE_PATH = 'data/cache/http_cache.sqlite'
+HTTP_CACHE_TTL = 7 * 24 * 3600          # detik; entri lebih muda dari ini dipakai tanpa revalidasi,
+                                        # entri yang lebih tua dibuang saat eviksi
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # batas ukuran body terkompresi di disk
+
+# Parameter pelacak yang tidak mengubah isi halaman
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+
+def canonical_url(url: str) -> str:
+    """Menormalkan URL agar artikel yang sama selalu memakai kunci cache yang sama."""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ]
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+class CacheEntry:
+    """
+    Satu entri cache: body HTML, validator, dan teks hasil ekstraksi. Jika
+    teks dibuat dengan versi ekstraksi lain, `text` bernilai None dan
+    `stale_extraction` True (body masih bisa diekstrak ulang).
+    """
+
+    def __init__(self, url, etag, last_modified, body, text, fetched_at, stale_extraction=False):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self._body = body
+        self.text = None if stale_extraction else text
+        self.fetched_at = fetched_at
+        self.stale_extraction = stale_extraction
+
+    @property
+    def body(self) -> str:
+        return zlib.decompress(self._body).decode('utf-8')
+
+    def is_recent(self, ttl: float) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+    def is_fresh(self, ttl: float) -> bool:
+        return self.text is not None and self.is_recent(ttl)
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Cache respons HTTP di disk (SQLite) dengan kunci URL kanonik.
+    Body disimpan terkompresi bersama ETag/Last-Modified untuk revalidasi
+    dan teks hasil ekstraksi beserta versi ekstraksinya. Entri kedaluwarsa
+    (lebih tua dari TTL) dibuang saat cache dibuka dan saat eviksi; sisanya
+    dievikasi LRU berbasis ukuran.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, ttl: float = HTTP_CACHE_TTL, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._total_bytes = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    text TEXT,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    extractor TEXT
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+            if 'extractor' not in columns:
+                # Cache lama: teksnya dianggap berasal dari versi ekstraksi yang tidak diketahui
+                self._conn.execute("ALTER TABLE responses ADD COLUMN extractor TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._evict()
+        return self._conn
+
+    def get(self, url: str, extractor: str = None):
+        """Entri untuk `url`; teks dari versi ekstraksi selain `extractor` tidak dikembalikan."""
+        conn = self._connect()
+        key = canonical_url(url)
+        row = conn.execute(
+            "SELECT url, etag, last_modified, body, text, fetched_at, extractor FROM responses WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), key))
+        conn.commit()
+        *fields, stored_extractor = row
+        return CacheEntry(*fields, stale_extraction=stored_extractor != extractor)
+
+    def refresh(self, url: str):
+        """Dipanggil setelah server menjawab 304: entri dianggap segar kembali."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, canonical_url(url)))
+        conn.commit()
+
+    def set_text(self, url: str, text, extractor: str = None):
+        """Mengganti teks hasil ekstraksi (mis. setelah ekstraksi ulang dari body cache)."""
+        conn = self._connect()
+        conn.execute("UPDATE responses SET text = ?, extractor = ? WHERE url = ?", (text, extractor, canonical_url(url)))
+        conn.commit()
+
+    def put(self, url: str, body: str, text, etag=None, last_modified=None, extractor: str = None):
+        conn = self._connect()
+        key = canonical_url(url)
+        compressed = zlib.compress(body.encode('utf-8'), 6)
+        now = time.time()
+        old = conn.execute("SELECT size FROM responses WHERE url = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(url, etag, last_modified, body, text, size, fetched_at, accessed_at, extractor) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, etag, last_modified, compressed, text, len(compressed), now, now, extractor)
+        )
+        conn.commit()
+        self._total_bytes += len(compressed) - (old[0] if old else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Hapus entri kedaluwarsa (lebih tua dari TTL), lalu entri yang paling
+        lama tidak diakses sampai ukuran turun ke 90% batas.
+        """
+        conn = self._connect()
+        cutoff = time.time() - self.ttl
+        expired = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses WHERE fetched_at < ?", (cutoff,)
+        ).fetchone()[0]
+        if expired:
+            conn.execute("DELETE FROM responses WHERE fetched_at < ?", (cutoff,))
+            conn.commit()
+            self._total_bytes -= expired
+        target = int(self.max_bytes * 0.9)
+        if self._total_bytes <= target:
+            return
+        cursor = conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC")
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+        conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
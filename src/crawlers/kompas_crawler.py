@@ -1,39 +1,32 @@
 # src/crawlers/kompas_crawler.py
 
-import asyncio
-from bs4 import BeautifulSoup
-from .base_crawler import CLIENT, get_full_text
+import time
 
-async def crawl_kompas(total_pages: int):
-    """Crawler khusus untuk Kompas.com."""
+from .base_crawler import fetch, crawl_listing_pages
+from .extraction import parse_listing
+from .parsing import run_parser
+
+async def crawl_kompas(session, total_pages: int, seen=None, queue=None):
+    """
+    Crawler khusus untuk Kompas.com. Semua request memakai koneksi milik `session` (CrawlSession).
+    Jika `queue` diberikan, metadata artikel dikirim ke antrean halaman demi
+    halaman (lihat src/crawlers/pipeline.py); jika tidak, dikembalikan sebagai list.
+    """
     print("\n[INFO] Memulai crawling Kompas.com...")
     base_url = "https://www.kompas.com/tag/timnas-indonesia?sort=desc"
-    tasks_metadata = []
-    
-    for page in range(1, total_pages + 1):
+
+    async def fetch_page(page):
         try:
-            await asyncio.sleep(0.5)
-            response = await CLIENT.get(f"{base_url}&page={page}")
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.find_all('div', class_='articleItem')
-            
-            for article in articles:
-                title_tag = article.find('h2', class_='articleTitle')
-                link_tag = article.find('a', class_='article-link')
-                date_tag = article.find('div', class_='articlePost-date')
-                if not all([title_tag, link_tag, date_tag]): continue
-                
-                url = link_tag['href']
-                tasks_metadata.append({
-                    'title': title_tag.get_text(strip=True), 
-                    'url': url, 
-                    'publish_date': date_tag.get_text(strip=True), 
-                    'source': 'Kompas.com', 
-                    'author': 'Kompas.com', 
-                    'full_text_coro': get_full_text(url, 'kompas')
-                })
+            response = await fetch(session, f"{base_url}&page={page}", source='kompas')
+            started = time.monotonic()
+            items = await run_parser(parse_listing, response.text, 'kompas')
+            session.metrics.record_parse('kompas', time.monotonic() - started)
+            return items
         except Exception as e:
             print(f"  - Gagal mengambil daftar artikel Kompas halaman {page}: {e}")
-            
-    print(f"[SUCCESS] Selesai mengambil metadata Kompas.com, ditemukan {len(tasks_metadata)} artikel.")
-    return tasks_metadata
\ No newline at end of file
+            return None
+
+    result = await crawl_listing_pages(fetch_page, total_pages, seen=seen, queue=queue)
+    found = result if queue is not None else len(result)
+    print(f"[SUCCESS] Selesai mengambil metadata Kompas.com, ditemukan {found} artikel.")
+    return result
@@ -0,0 +1,197 @@
+# src/crawlers/metrics.py
+
+import json
+import os
+import time
+from bisect import bisect_left
+
+# Batas atas bucket histogram (detik), mengikuti konvensi histogram Prometheus
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+PARSE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float('inf'))
+METRICS_JSON_PATH = 'data/state/crawl_metrics.json'
+# Peringatan jika tingkat keberhasilan ekstraksi di bawah ini (mis. layout situs berubah)
+EXTRACTION_ALERT_RATE = 0.5
+EXTRACTION_ALERT_MIN_SAMPLES = 10
+
+
+class Histogram:
+    """Histogram kumulatif sederhana dengan bucket tetap."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float):
+        """Perkiraan kuantil: batas atas bucket tempat kuantil jatuh."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 4) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': {str(b): n for b, n in zip(self.buckets, self.counts)},
+        }
+
+
+class _SourceStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes = 0
+        self.status = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.parse = Histogram(PARSE_BUCKETS)
+        self.cache_hits = 0
+        self.extracted = 0
+        self.extraction_missing = 0
+        self.articles = 0
+
+
+class CrawlMetrics:
+    """
+    Metrik crawling per sumber: histogram latensi request, ukuran respons,
+    komposisi status HTTP, retry, waktu parsing, tingkat keberhasilan ekstraksi
+    dan jumlah artikel per detik. Hanya dipakai dari satu event loop.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._sources = {}
+
+    def _stats(self, source: str) -> _SourceStats:
+        stats = self._sources.get(source)
+        if stats is None:
+            stats = self._sources[source] = _SourceStats()
+        return stats
+
+    def record_request(self, source: str, latency: float, status, size: int = 0, attempt: int = 0):
+        """`status` berupa kode HTTP, atau nama exception untuk kegagalan jaringan."""
+        stats = self._stats(source)
+        stats.requests += 1
+        stats.retries += attempt > 0
+        stats.bytes += size
+        stats.status[str(status)] = stats.status.get(str(status), 0) + 1
+        stats.latency.observe(latency)
+
+    def record_failure(self, source: str):
+        self._stats(source).failures += 1
+
+    def record_parse(self, source: str, seconds: float):
+        self._stats(source).parse.observe(seconds)
+
+    def record_cache_hit(self, source: str):
+        self._stats(source).cache_hits += 1
+
+    def record_extraction(self, source: str, found: bool):
+        stats = self._stats(source)
+        if found:
+            stats.extracted += 1
+        else:
+            stats.extraction_missing += 1
+
+    def record_article(self, source: str):
+        self._stats(source).articles += 1
+
+    def summary(self) -> dict:
+        elapsed = max(time.time() - self.started, 1e-9)
+        sources = {}
+        for name, stats in sorted(self._sources.items()):
+            attempts = stats.extracted + stats.extraction_missing
+            sources[name] = {
+                'requests': stats.requests,
+                'retries': stats.retries,
+                'failures': stats.failures,
+                'bytes': stats.bytes,
+                'status': dict(sorted(stats.status.items())),
+                'latency_seconds': stats.latency.summary(),
+                'parse_seconds': stats.parse.summary(),
+                'cache_hits': stats.cache_hits,
+                'extraction_success_rate': round(stats.extracted / attempts, 4) if attempts else None,
+                'articles': stats.articles,
+                'articles_per_sec': round(stats.articles / elapsed, 3),
+            }
+        return {
+            'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            'elapsed_seconds': round(elapsed, 2),
+            'sources': sources,
+        }
+
+    def extraction_alerts(self):
+        """Sumber yang ekstraksinya sebagian besar gagal (indikasi layout situs berubah)."""
+        alerts = []
+        for name, stats in self._sources.items():
+            attempts = stats.extracted + stats.extraction_missing
+            if attempts >= EXTRACTION_ALERT_MIN_SAMPLES and stats.extracted / attempts < EXTRACTION_ALERT_RATE:
+                alerts.append(name)
+        return alerts
+
+    def write_json(self, path: str = METRICS_JSON_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Metrik dalam format teks eksposisi Prometheus (mis. untuk textfile collector)."""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, help_text, attr):
+            metric(name, 'histogram', help_text)
+            for source, stats in sorted(self._sources.items()):
+                hist = getattr(stats, attr)
+                cumulative = 0
+                for bound, n in zip(hist.buckets, hist.counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{{source="{source}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{source="{source}"}} {hist.total}')
+                lines.append(f'{name}_count{{source="{source}"}} {hist.count}')
+
+        def counter(name, help_text, attr):
+            metric(name, 'counter', help_text)
+            for source, stats in sorted(self._sources.items()):
+                lines.append(f'{name}{{source="{source}"}} {getattr(stats, attr)}')
+
+        histogram('crawl_request_duration_seconds', 'Latensi request HTTP.', 'latency')
+        histogram('crawl_parse_duration_seconds', 'Waktu parsing HTML.', 'parse')
+        counter('crawl_response_bytes_total', 'Total ukuran body respons.', 'bytes')
+        counter('crawl_retries_total', 'Jumlah request ulang.', 'retries')
+        counter('crawl_failures_total', 'URL yang gagal diambil.', 'failures')
+        counter('crawl_cache_hits_total', 'Artikel yang dilayani dari cache.', 'cache_hits')
+        counter('crawl_extraction_success_total', 'Artikel yang teksnya berhasil diekstrak.', 'extracted')
+        counter('crawl_extraction_missing_total', 'Artikel tanpa teks hasil ekstraksi.', 'extraction_missing')
+        counter('crawl_articles_total', 'Artikel yang ditulis ke output.', 'articles')
+
+        metric('crawl_responses_total', 'counter', 'Respons per kode status.')
+        for source, stats in sorted(self._sources.items()):
+            for status, n in sorted(stats.status.items()):
+                lines.append(f'crawl_responses_total{{source="{source}",status="{status}"}} {n}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
@@ -0,0 +1,70 @@
+# src/crawlers/parsing.py
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+
+def _pick_backend():
+    """Pilih parser tercepat yang terpasang: selectolax > lxml > html.parser."""
+    try:
+        import selectolax.lexbor  # noqa: F401
+        return 'selectolax'
+    except ImportError:
+        pass
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+# --- Pengaturan parsing HTML ---
+# Bisa dipaksa lewat environment, mis. HTML_PARSER=html.parser
+HTML_PARSER = os.getenv('HTML_PARSER', _pick_backend())
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+
+_POOL = None
+
+
+def make_soup(html: str, parse_only: SoupStrainer = None, backend: str = None) -> BeautifulSoup:
+    """
+    Membuat BeautifulSoup dengan backend terpilih. `parse_only` membatasi pohon
+    yang dibangun ke subtree yang dibutuhkan saja. Backend 'selectolax' tidak
+    berlaku di sini (BeautifulSoup tidak mendukungnya) sehingga jatuh ke lxml.
+    """
+    backend = backend or HTML_PARSER
+    if backend == 'selectolax':
+        backend = 'lxml'
+    try:
+        return BeautifulSoup(html, backend, parse_only=parse_only)
+    except FeatureNotFound:
+        # Backend tidak terpasang: gunakan parser bawaan Python
+        return BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+
+
+def get_parse_pool():
+    global _POOL
+    if _POOL is None and PARSE_WORKERS > 0:
+        _POOL = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _POOL
+
+
+async def run_parser(func, *args):
+    """
+    Menjalankan fungsi parsing (harus fungsi top-level agar bisa di-pickle) di
+    process pool supaya parsing yang berat tidak memblokir event loop.
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+def shutdown_parse_pool():
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
@@ -0,0 +1,108 @@
+# src/crawlers/pipeline.py
+
+import asyncio
+import csv
+import os
+
+from .base_crawler import get_full_text
+from .concurrency import FetchFailure
+from .http_cache import canonical_url
+from .parsing import shutdown_parse_pool
+
+# --- Pengaturan pipeline crawling berita ---
+# Jumlah request yang benar-benar berjalan diatur per host oleh AdaptiveConcurrency
+FETCH_WORKERS = 32      # jumlah worker pengambil teks lengkap
+QUEUE_MAXSIZE = 100     # batas antrean; producer menunggu jika worker tertinggal
+NEWS_FIELDS = ['title', 'url', 'publish_date', 'source', 'author', 'full_text']
+FAILURE_FIELDS = ['url', 'crawler', 'status', 'reason', 'attempts', 'failed_at']
+
+
+class CsvSink:
+    """Menulis record satu per satu ke file CSV sehingga tidak ada list besar di memori."""
+
+    def __init__(self, path: str, fieldnames=NEWS_FIELDS, append: bool = True, flush_every: int = 50):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        write_header = not (append and os.path.exists(path))
+        self.path = path
+        self.count = 0
+        self.flush_every = flush_every
+        self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, record: dict):
+        self._writer.writerow(record)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+async def run_crawl_pipeline(session, producers, sink, seen=None, failures=None, workers: int = FETCH_WORKERS, queue_maxsize: int = QUEUE_MAXSIZE):
+    """
+    Menjalankan crawling berita secara streaming.
+
+    `producers` adalah list fungsi `f(queue)` yang mengembalikan coroutine crawler
+    (mis. `lambda q: crawl_detik(session, 70, queue=q)`). Metadata dari halaman daftar
+    langsung diambil teks lengkapnya oleh sekumpulan worker (lewat `session`,
+    CrawlSession yang sama dengan producer) dan ditulis ke `sink`.
+    URL yang berhasil ditulis dicatat ke `seen` (SeenUrlIndex) jika diberikan;
+    index tidak disimpan di sini, pemanggil memanggil `seen.save()` setelah
+    `sink` ditutup (buffer sink sudah tertulis) agar tidak ada URL yang
+    tercatat tanpa artikelnya.
+    Artikel yang gagal diambil ditulis ke `failures` (CsvSink dengan
+    FAILURE_FIELDS) dan tidak dicatat ke `seen`, sehingga dicoba lagi pada run berikutnya.
+    Setiap URL diklaim sebelum diambil, sehingga URL yang muncul di beberapa
+    halaman daftar (atau diambil dua worker bersamaan) hanya diproses sekali per run.
+    """
+    queue = asyncio.Queue(maxsize=queue_maxsize)
+    failed = 0
+    claimed = set()     # URL kanonik yang sudah diambil/sedang diambil pada run ini
+
+    async def worker():
+        nonlocal failed
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                url_key = canonical_url(item['url'])
+                if url_key in claimed or (seen is not None and item['url'] in seen):
+                    continue
+                # Klaim sebelum await agar worker lain tidak mengambil URL yang sama
+                claimed.add(url_key)
+                item['full_text'] = await get_full_text(session, item['url'], item['crawler'])
+                sink.write(item)
+                session.metrics.record_article(item['crawler'])
+                if seen is not None:
+                    seen.add(item['url'])
+            except FetchFailure as e:
+                failed += 1
+                print(f"   - Gagal mengambil {e.url}: {e.reason} setelah {e.attempts} percobaan")
+                if failures is not None:
+                    failures.write({**e.to_record(), 'crawler': item['crawler']})
+            except Exception as e:
+                print(f"   - Gagal memproses artikel {item.get('url')}: {e}")
+            finally:
+                queue.task_done()
+
+    worker_tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        results = await asyncio.gather(*(producer(queue) for producer in producers), return_exceptions=True)
+        for res in results:
+            if isinstance(res, Exception):
+                print(f"  - Crawler gagal: {res}")
+        # Satu sinyal berhenti per worker, setelah semua item di antrean
+        for _ in worker_tasks:
+            await queue.put(None)
+        await asyncio.gather(*worker_tasks)
+    finally:
+        for task in worker_tasks:
+            task.cancel()
+        shutdown_parse_pool()
+
+    print(f"[INFO] Selesai mengambil teks lengkap berita. Berhasil: {sink.count} artikel, gagal: {failed}.")
+    return sink.count
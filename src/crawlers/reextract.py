@@ -0,0 +1,87 @@
+# src/crawlers/reextract.py
+#
+# Menjalankan ulang engine ekstraksi (src/crawlers/extraction.py) atas arsip
+# HTML mentah, tanpa crawling ulang. Berguna setelah selector diubah atau bug
+# ekstraksi diperbaiki. `full_text` artikel di dataset mentah diganti dengan
+# hasil baru (dicocokkan lewat URL kanonik), lalu run_preprocessing berikutnya
+# diminta membangun ulang dataset master.
+#
+# Usage:
+#   python -m src.crawlers.reextract                      # semua sumber
+#   python -m src.crawlers.reextract --source kompas --workers 8
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .extraction import extract_full_text
+from .html_archive import HTML_ARCHIVE_DIR, HtmlArchive, read_record
+from .http_cache import canonical_url
+from .parsing import PARSE_WORKERS
+from ..preprocessing.incremental import load_state, save_state
+from ..utils.raw_dataset import RAW_DATASET_DIR, replace_full_text
+
+REEXTRACT_CHUNKSIZE = 32    # record per tugas worker
+
+
+def _reextract_one(task):
+    # Worker membaca dan mendekompresi record sendiri, jadi yang dikirim antar
+    # proses hanya lokasi record, bukan HTML-nya
+    directory, url, source, segment, offset, length, codec, fetched_at = task
+    html = read_record(directory, segment, offset, length, codec)
+    return url, source, extract_full_text(html, source), fetched_at
+
+
+def reextract(directory: str = HTML_ARCHIVE_DIR, source: str = None,
+              root: str = RAW_DATASET_DIR, workers: int = PARSE_WORKERS) -> dict:
+    """
+    Mengekstrak ulang versi terbaru setiap URL di arsip lalu mengganti
+    `full_text` artikel berita yang cocok di dataset mentah `root`. URL yang
+    teksnya tidak ditemukan dibiarkan apa adanya. Jika ada yang berubah,
+    state preprocessing ditandai agar master dibangun ulang (content_hash
+    record yang teksnya berubah ikut berubah).
+    """
+    archive = HtmlArchive(directory)
+    tasks = [(directory, *row) for row in archive.latest(source)]
+    archive.close()
+
+    started = time.perf_counter()
+    if workers > 1 and len(tasks) > REEXTRACT_CHUNKSIZE:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_reextract_one, tasks, chunksize=REEXTRACT_CHUNKSIZE))
+    else:
+        results = [_reextract_one(task) for task in tasks]
+    texts = {url: text for url, _, text, _ in results if text is not None}
+    elapsed = time.perf_counter() - started
+
+    updated = replace_full_text(texts, key=canonical_url, root=root, source_type='news')
+    if updated:
+        save_state(dict(load_state(), rebuild_reason='reextract'))
+    return {'records': len(tasks), 'found': len(texts), 'updated': updated, 'seconds': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekstraksi ulang teks artikel dari arsip HTML.")
+    parser.add_argument("--archive", default=HTML_ARCHIVE_DIR, help="Folder arsip HTML.")
+    parser.add_argument("--source", default=None, help="Hanya sumber ini (mis. detik, kompas).")
+    parser.add_argument("--root", default=RAW_DATASET_DIR, help="Dataset mentah yang full_text-nya diperbarui.")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS, help="Jumlah proses ekstraksi.")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.archive, 'index.sqlite')):
+        print(f"[ERROR] Arsip HTML tidak ditemukan di '{args.archive}'. Jalankan crawling dengan ARCHIVE_HTML=1.")
+        return
+
+    print(f"[INFO] Mengekstrak ulang arsip '{args.archive}' dengan {args.workers} worker...")
+    stats = reextract(args.archive, args.source, args.root, args.workers)
+    rate = stats['records'] / stats['seconds'] if stats['seconds'] else 0
+    print(f"[SUCCESS] {stats['records']} artikel diproses dalam {stats['seconds']:.1f} detik "
+          f"({rate:.0f} artikel/detik), teks ditemukan: {stats['found']}.")
+    print(f"[INFO] {stats['updated']} record di '{args.root}' diperbarui.")
+    if stats['updated']:
+        print("[INFO] Jalankan run_preprocessing.py; dataset master akan dibangun ulang.")
+
+
+if __name__ == '__main__':
+    main()
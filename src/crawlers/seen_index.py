@@ -0,0 +1,57 @@
+# src/crawlers/seen_index.py
+
+import hashlib
+import os
+from array import array
+
+from .http_cache import canonical_url
+
+SEEN_INDEX_PATH = 'data/state/seen_urls.bin'
+
+
+def _url_hash(url: str) -> int:
+    """Hash 64-bit dari URL kanonik (cukup untuk jutaan URL tanpa tabrakan berarti)."""
+    digest = hashlib.blake2b(canonical_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class SeenUrlIndex:
+    """
+    Himpunan URL artikel yang sudah pernah disimpan, dipersist sebagai file
+    append-only berisi hash 8 byte per URL.
+    """
+
+    def __init__(self, path: str = SEEN_INDEX_PATH):
+        self.path = path
+        self._hashes = set()
+        self._pending = array('Q')
+        if os.path.exists(path):
+            stored = array('Q')
+            with open(path, 'rb') as f:
+                stored.frombytes(f.read())
+            self._hashes.update(stored)
+
+    def __contains__(self, url: str) -> bool:
+        return _url_hash(url) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, url: str):
+        h = _url_hash(url)
+        if h not in self._hashes:
+            self._hashes.add(h)
+            self._pending.append(h)
+
+    def update(self, urls):
+        for url in urls:
+            self.add(url)
+
+    def save(self):
+        """Menambahkan hash baru ke file index."""
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'ab') as f:
+            self._pending.tofile(f)
+        self._pending = array('Q')
@@ -0,0 +1,88 @@
+# src/crawlers/session.py
+
+import os
+
+import httpx
+
+from .base_crawler import RateLimiter
+from .concurrency import AdaptiveConcurrency, INITIAL_CONCURRENCY
+from .html_archive import ARCHIVE_HTML, HtmlArchive
+from .metrics import CrawlMetrics
+
+# --- Pengaturan koneksi HTTP ---
+MAX_CONNECTIONS = 100           # total koneksi terbuka ke semua host
+MAX_KEEPALIVE_CONNECTIONS = 40  # koneksi idle yang disimpan untuk dipakai ulang
+KEEPALIVE_EXPIRY = 30.0         # detik sebelum koneksi idle ditutup
+PER_HOST_CONNECTIONS = 16       # batas atas request bersamaan ke satu host
+REQUEST_TIMEOUT = 30.0
+# HTTP/2 opsional: butuh paket `h2` (pip install 'httpx[http2]'), aktifkan lewat HTTP2=1
+HTTP2 = os.getenv('HTTP2', '0') == '1'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 1.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class CrawlSession:
+    """
+    Satu sesi crawling: memiliki client httpx (pool koneksi yang dipakai ulang
+    untuk ribuan artikel), rate limiter, konkurensi adaptif per host, metrik
+    crawling (`session.metrics`), dan arsip HTML mentah jika `archive_html`.
+    Dipakai sebagai async context manager di dalam event loop yang sama dengan
+    crawler, sehingga client selalu ditutup dengan bersih:
+
+        async with CrawlSession() as session:
+            await crawl_detik(session, total_pages=5)
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = KEEPALIVE_EXPIRY,
+                 per_host_connections: int = PER_HOST_CONNECTIONS,
+                 http2: bool = HTTP2, timeout: float = REQUEST_TIMEOUT, transport=None,
+                 archive_html: bool = ARCHIVE_HTML):
+        if http2 and not _http2_available():
+            print("[WARN] Paket 'h2' tidak terpasang, memakai HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.transport = transport
+        # Batas per host ditegakkan oleh AdaptiveConcurrency (tidak pernah naik melewati batas ini)
+        self.limiter = RateLimiter()
+        self.concurrency = AdaptiveConcurrency(
+            initial=min(INITIAL_CONCURRENCY, per_host_connections), maximum=per_host_connections
+        )
+        self.metrics = CrawlMetrics()
+        self.archive = HtmlArchive() if archive_html else None
+        self.client = None
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT},
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.archive is not None:
+            self.archive.close()
@@ -0,0 +1,260 @@
+# src/crawlers/twitter_crawler.py
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# --- Pengaturan crawling Twitter ---
+TWITTER_WORKERS = 4                 # jumlah shard (kata kunci x hari) yang dikerjakan bersamaan
+TWITTER_RATE_PER_SEC = 1.0          # rata-rata request halaman per detik untuk semua shard
+TWITTER_RATE_BURST = 4
+TWEETS_PER_PAGE = 20                # perkiraan jumlah tweet per request halaman pencarian
+TWITTER_CHECKPOINT_DIR = 'data/state/twitter_shards'
+
+
+class SharedRateLimit:
+    """Token bucket yang aman dipakai bersama oleh banyak thread."""
+
+    def __init__(self, rate: float = TWITTER_RATE_PER_SEC, burst: int = TWITTER_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # Lock dipegang selama menunggu agar antrean dilayani bergiliran
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                time.sleep((1 - self._tokens) / self.rate)
+
+
+# --- Backend pengambilan tweet ---
+# Backend adalah objek dengan method search(query, limit, throttle) yang
+# menghasilkan dict tweet (id, date, content, username, url, likes, replies,
+# retweets). `throttle()` wajib dipanggil sebelum setiap request halaman.
+
+class SnscrapeBackend:
+    """Backend bawaan: snscrape (tanpa API key)."""
+
+    def search(self, query: str, limit: int, throttle):
+        import snscrape.modules.twitter as sntwitter
+
+        scraper = sntwitter.TwitterSearchScraper(query)
+        for i, tweet in enumerate(scraper.get_items()):
+            if i >= limit:
+                break
+            if i % TWEETS_PER_PAGE == 0:
+                # snscrape mengambil halaman sendiri; throttle diperkirakan per halaman
+                throttle()
+            yield {
+                'id': str(tweet.id),
+                'date': tweet.date.isoformat(),
+                'content': getattr(tweet, 'rawContent', None) or tweet.content,
+                'username': tweet.user.username,
+                'url': tweet.url,
+                'likes': tweet.likeCount,
+                'replies': tweet.replyCount,
+                'retweets': tweet.retweetCount,
+            }
+
+
+class HttpSearchBackend:
+    """
+    Backend HTTP sederhana untuk endpoint pencarian yang mengembalikan JSON
+    {"tweets": [...], "next_cursor": "..."} dari GET {base_url}/search?q=...&cursor=...
+    Dipakai untuk server pengganti lokal saat pengujian.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        import httpx
+        self.base_url = base_url.rstrip('/')
+        self.client = httpx.Client(timeout=timeout)
+
+    def search(self, query: str, limit: int, throttle):
+        cursor = None
+        fetched = 0
+        while fetched < limit:
+            throttle()
+            params = {'q': query}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(f"{self.base_url}/search", params=params)
+            response.raise_for_status()
+            page = response.json()
+            for tweet in page.get('tweets', []):
+                if fetched >= limit:
+                    return
+                fetched += 1
+                yield tweet
+            cursor = page.get('next_cursor')
+            if not cursor or not page.get('tweets'):
+                return
+
+
+def get_backend():
+    """TWITTER_API_URL (opsional) mengarahkan crawler ke backend HTTP, mis. server lokal."""
+    base_url = os.getenv('TWITTER_API_URL')
+    return HttpSearchBackend(base_url) if base_url else SnscrapeBackend()
+
+
+# --- Sharding & checkpoint ---
+
+def make_shards(keywords, start_date: str, end_date: str):
+    """Membagi setiap kata kunci menjadi jendela satu hari (start_date s.d. end_date, inklusif)."""
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    return [(keyword, day) for keyword in keywords for day in days]
+
+
+def shard_query(keyword: str, day: str) -> str:
+    next_day = (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    return f"{keyword} since:{day} until:{next_day}"
+
+
+def _shard_path(checkpoint_dir: str, keyword: str, day: str) -> str:
+    slug = re.sub(r'[^a-z0-9]+', '_', keyword.lower()).strip('_')
+    return os.path.join(checkpoint_dir, slug, f'{day}.json')
+
+
+def _load_shard(path: str):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_shard(path: str, shard: dict):
+    # Ditulis atomik: file shard hanya ada jika shard selesai diambil
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(shard, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def mark_exported(checkpoint_dir: str = TWITTER_CHECKPOINT_DIR):
+    """
+    Dipanggil setelah hasil crawl disimpan: isi tweet di setiap checkpoint
+    dibuang dan hanya ID-nya yang disimpan, sehingga run berikutnya tidak
+    mengambil ulang shard yang sudah lengkap maupun mengekspor ulang tweetnya.
+    """
+    for root, _, files in os.walk(checkpoint_dir):
+        for name in files:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(root, name)
+            shard = _load_shard(path)
+            if not shard.get('exported'):
+                ids = shard.get('ids', []) + [t['id'] for t in shard['tweets']]
+                _save_shard(path, {'exported': True, 'complete': shard.get('complete', True), 'ids': ids})
+
+
+def _crawl_shard(backend, limiter, keyword, day, limit, path, previous=None):
+    """
+    Mengambil satu shard lalu menyimpannya sebagai checkpoint. Hari yang belum
+    berakhir disimpan sebagai shard parsial (`complete` False) yang diambil
+    ulang pada run berikutnya; `previous` (checkpoint parsial sebelumnya)
+    digabung sehingga tweet yang sudah pernah diambil/diekspor tidak ganda.
+    """
+    previous = previous or {'ids': [], 'tweets': []}
+    known = set(previous['ids']) | {t['id'] for t in previous['tweets']}
+    fresh = [t for t in backend.search(shard_query(keyword, day), limit, limiter.acquire) if t['id'] not in known]
+    tweets = previous['tweets'] + fresh
+    _save_shard(path, {
+        'exported': False, 'complete': day < datetime.now().strftime('%Y-%m-%d'),
+        'ids': previous['ids'], 'tweets': tweets,
+    })
+    return tweets
+
+
+def crawl_twitter(keywords, start_date, end_date, max_tweets_per_keyword,
+                  backend=None, workers=TWITTER_WORKERS, checkpoint_dir=TWITTER_CHECKPOINT_DIR,
+                  limiter=None):
+    """
+    Mengambil tweet untuk setiap kata kunci, dibagi per hari antara start_date
+    dan end_date. Shard dikerjakan bersamaan di bawah satu rate limit. Shard
+    yang sudah selesai disimpan sebagai checkpoint sehingga crawl yang terhenti
+    dapat dilanjutkan tanpa mengambil ulang shard tersebut; shard yang sudah
+    diekspor (lihat `mark_exported`) dilewati. Shard hari ini (belum lengkap)
+    diambil ulang setiap run, tetapi tweet yang sudah diekspor tidak ikut lagi. Batas per kata kunci dibagi rata
+    ke setiap hari. Tweet yang muncul di beberapa kata kunci hanya disimpan sekali.
+    """
+    backend = backend or get_backend()
+    limiter = limiter or SharedRateLimit()
+    shards = make_shards(keywords, start_date, end_date)
+    if not shards:
+        print("[WARN] Rentang tanggal kosong, tidak ada shard yang dikerjakan.")
+        return pd.DataFrame()
+    days = len(shards) // len(keywords)
+    per_shard = max(1, math.ceil(max_tweets_per_keyword / days))
+
+    results = {}
+    exported_ids = set()
+    pending = []
+    for keyword, day in shards:
+        path = _shard_path(checkpoint_dir, keyword, day)
+        if not os.path.exists(path):
+            pending.append((keyword, day, path, None))
+            continue
+        shard = _load_shard(path)
+        exported_ids.update(shard.get('ids', []))
+        if not shard['exported']:
+            results[(keyword, day)] = shard['tweets']
+        if not shard.get('complete', True):
+            # Shard parsial (hari yang belum berakhir): ambil lagi, lanjutkan dari checkpoint
+            previous = {'ids': shard.get('ids', []), 'tweets': shard.get('tweets', [])}
+            pending.append((keyword, day, path, previous))
+    print(f"[INFO] {len(shards)} shard ({len(keywords)} kata kunci x {days} hari), "
+          f"{len(shards) - len(pending)} dari checkpoint, {len(pending)} akan diambil.")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_crawl_shard, backend, limiter, keyword, day, per_shard, path, previous): (keyword, day)
+            for keyword, day, path, previous in pending
+        }
+        for future in as_completed(futures):
+            keyword, day = futures[future]
+            try:
+                results[(keyword, day)] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[ERROR] Shard '{keyword}' {day} gagal: {e}")
+    if failed:
+        print(f"[WARN] {failed} shard gagal; jalankan ulang untuk melanjutkan dari checkpoint.")
+
+    # Gabungkan sesuai urutan shard agar hasil deterministik; dedup berdasarkan ID tweet
+    rows = {}
+    for keyword, day in shards:
+        for tweet in results.get((keyword, day), []):
+            if tweet['id'] in rows or tweet['id'] in exported_ids:
+                continue
+            rows[tweet['id']] = {
+                'source_type': 'twitter',
+                'source': 'Twitter',
+                'author': tweet.get('username'),
+                'publish_date': tweet.get('date'),
+                'full_text': tweet.get('content'),
+                'url': tweet.get('url'),
+                'likes': tweet.get('likes', 0),
+                'comments': tweet.get('replies', 0),
+                'shares': tweet.get('retweets', 0),
+                'item_id': tweet['id'],
+                'keyword': keyword,
+            }
+
+    print(f"[SUCCESS] Selesai crawling Twitter, {len(rows)} tweet unik.")
+    return pd.DataFrame(list(rows.values()))
@@ -0,0 +1,72 @@
+# src/crawlers/youtube_quota.py
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Biaya unit YouTube Data API v3 per pemanggilan
+API_COSTS = {
+    'search.list': 100,
+    'commentThreads.list': 1,
+    'videos.list': 1,
+}
+DAILY_QUOTA = 10000
+QUOTA_STATE_PATH = 'data/state/youtube_quota.json'
+
+
+class QuotaExhausted(Exception):
+    """Sisa kuota harian tidak cukup untuk pemanggilan berikutnya."""
+
+
+def _quota_day() -> str:
+    # Kuota YouTube di-reset tengah malam waktu Pasifik (pakai UTC-8 sebagai pendekatan)
+    return (datetime.now(timezone.utc) - timedelta(hours=8)).strftime('%Y-%m-%d')
+
+
+class QuotaBudget:
+    """
+    Pencatat pemakaian kuota harian yang aman dipakai bersama oleh banyak thread.
+    Pemakaian disimpan ke disk sehingga beberapa run dalam sehari berbagi kuota
+    yang sama. `reserve` adalah unit yang sengaja tidak dipakai sebagai cadangan.
+    """
+
+    def __init__(self, daily_limit: int = DAILY_QUOTA, reserve: int = 0, path: str = QUOTA_STATE_PATH):
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        self.path = path
+        self._lock = threading.Lock()
+        self._day = _quota_day()
+        self.used = 0
+        self.calls = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state.get('day') == self._day:
+                self.used = state.get('used', 0)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.reserve - self.used)
+
+    def can_afford(self, method: str, calls: int = 1) -> bool:
+        return API_COSTS[method] * calls <= self.remaining
+
+    def spend(self, method: str):
+        """Memesan unit untuk satu pemanggilan; melempar QuotaExhausted jika tidak cukup."""
+        cost = API_COSTS[method]
+        with self._lock:
+            if _quota_day() != self._day:
+                self._day, self.used = _quota_day(), 0
+            if cost > self.remaining:
+                raise QuotaExhausted(f"Kuota tidak cukup untuk {method} (butuh {cost}, sisa {self.remaining})")
+            self.used += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock:
+            with open(self.path, 'w') as f:
+                json.dump({'day': self._day, 'used': self.used}, f)
@@ -0,0 +1,88 @@
+# src/crawlers/youtube_state.py
+
+import json
+import os
+import threading
+import time
+
+YOUTUBE_STATE_PATH = 'data/state/youtube_videos.json'
+BASE_INTERVAL_HOURS = 6         # jeda kunjungan ulang untuk video yang masih ramai
+MAX_INTERVAL_HOURS = 24 * 14    # video yang sudah sepi paling lama dikunjungi 2 minggu sekali
+MAX_COMMENT_IDS = 2000          # jumlah ID komentar terbaru yang diingat per video
+
+
+class VideoSyncState:
+    """
+    Status sinkronisasi per video: `publishedAt` terbaru yang pernah dilihat
+    (watermark), ID komentar terbaru, waktu crawl terakhir, dan jadwal kunjungan
+    berikutnya. Video yang tidak mendapat komentar baru dikunjungi makin jarang.
+    """
+
+    def __init__(self, path: str = YOUTUBE_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.videos = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.videos = json.load(f)
+
+    def get(self, video_id: str):
+        return self.videos.get(video_id)
+
+    def is_due(self, video_id: str, now: float = None) -> bool:
+        state = self.videos.get(video_id)
+        return state is None or (now or time.time()) >= state.get('next_crawl', 0)
+
+    def record(self, video_id: str, emitted_ids, new_count: int, newest_published_at: str = None, now: float = None):
+        """
+        Mencatat hasil crawl satu video. `emitted_ids` hanya berisi ID komentar
+        yang benar-benar disimpan (lolos filter bahasa dan batas per video).
+        `newest_published_at` adalah `publishedAt` terbaru yang diproses;
+        komentar yang tidak terambil karena batas per video tidak dikejar lagi.
+        """
+        now = now or time.time()
+        with self._lock:
+            state = self._state(video_id)
+            if newest_published_at and (state['newest_published_at'] is None
+                                        or newest_published_at > state['newest_published_at']):
+                state['newest_published_at'] = newest_published_at
+            self._remember(state, emitted_ids)
+
+            if new_count > 0:
+                state['interval_hours'] = BASE_INTERVAL_HOURS
+            else:
+                state['interval_hours'] = min(MAX_INTERVAL_HOURS, state['interval_hours'] * 2)
+            state['last_crawl'] = now
+            state['last_new_count'] = new_count
+            state['next_crawl'] = now + state['interval_hours'] * 3600
+            self.videos[video_id] = state
+
+    def record_partial(self, video_id: str, emitted_ids):
+        """
+        Untuk crawl yang berhenti di tengah (kuota habis / error): ID komentar
+        yang sudah disimpan diingat agar tidak ditulis ulang, tetapi watermark
+        dan jadwal kunjungan tidak diubah sehingga video dicoba lagi utuh.
+        """
+        with self._lock:
+            state = self._state(video_id)
+            self._remember(state, emitted_ids)
+            self.videos[video_id] = state
+
+    def _state(self, video_id: str) -> dict:
+        return self.videos.get(video_id) or {
+            'newest_published_at': None, 'comment_ids': [], 'interval_hours': BASE_INTERVAL_HOURS
+        }
+
+    @staticmethod
+    def _remember(state: dict, emitted_ids):
+        known = set(state['comment_ids'])
+        fresh_ids = [cid for cid in emitted_ids if cid not in known]
+        state['comment_ids'] = (fresh_ids + state['comment_ids'])[:MAX_COMMENT_IDS]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.videos, f)
+            os.replace(tmp_path, self.path)
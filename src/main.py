@@ -8,31 +8,34 @@ from crawlers.detik_crawler import crawl_detik
 from crawlers.kompas_crawler import crawl_kompas
 from crawlers.bola_crawler import crawl_bola
 from crawlers.facebook_crawler import crawl_facebook
+from crawlers.pipeline import CsvSink, run_crawl_pipeline
+from crawlers.session import CrawlSession
 # from crawlers.twitter_crawler import crawl_twitter # Kita biarkan import-nya di sini
 # Import semua utilitas
-from preprocessing.cleaner import clean_text, format_date
+from preprocessing.cleaner import clean_series
+from preprocessing.dates import normalize_dates
 from analysis.sentiment_analyzer import translate_to_english, analyze_sentiment
 
+NEWS_STREAM_PATH = 'data/processed/news_stream.csv'
+
 async def run_news_crawlers():
-    # Fungsi ini sudah benar, tidak perlu diubah
+    """Crawling berita secara streaming: daftar artikel langsung diteruskan ke worker teks lengkap."""
     print("\n[INFO] Menjalankan crawler portal berita secara paralel...")
-    metadata_tasks = [crawl_detik(total_pages=70), crawl_kompas(total_pages=70), crawl_bola(total_pages=1)]
-    results_nested_metadata = await asyncio.gather(*metadata_tasks)
-    all_articles_metadata = [item for sublist in results_nested_metadata for item in sublist]
-    print(f"\n[INFO] Metadata dari {len(all_articles_metadata)} artikel berita berhasil diambil. Mengambil teks lengkap...")
-    CONCURRENT_LIMIT = 5
-    semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
-    async def fetch_full_text_with_limit(task):
-        async with semaphore:
-            await asyncio.sleep(1) 
-            full_text = await task.pop('full_text_coro')
-            task['full_text'] = full_text
-            return task
-    full_article_tasks = [fetch_full_text_with_limit(task) for task in all_articles_metadata]
-    results = await asyncio.gather(*full_article_tasks, return_exceptions=True)
-    final_articles = [res for res in results if not isinstance(res, Exception)]
-    print(f"[INFO] Selesai mengambil teks lengkap berita. Berhasil: {len(final_articles)} artikel.")
-    return pd.DataFrame(final_articles)
+    # Hasil ditulis bertahap ke CSV, lalu dibaca kembali sebagai DataFrame
+    sink = CsvSink(NEWS_STREAM_PATH, append=False)
+    try:
+        async with CrawlSession() as session:
+            producers = [
+                lambda q: crawl_detik(session, total_pages=70, queue=q),
+                lambda q: crawl_kompas(session, total_pages=70, queue=q),
+                lambda q: crawl_bola(session, total_pages=1, queue=q)
+            ]
+            saved = await run_crawl_pipeline(session, producers, sink)
+    finally:
+        sink.close()
+    if not saved:
+        return pd.DataFrame()
+    return pd.read_csv(NEWS_STREAM_PATH)
 
 def main():
     """Pipeline final yang menggabungkan data dari Berita & Facebook."""
@@ -69,9 +72,9 @@ def main():
     if 'title' not in df_crawled.columns:
         df_crawled['title'] = df_crawled['full_text'].str[:70] + '...'
     df_crawled['title'].fillna(df_crawled['full_text'].str[:70] + '...', inplace=True)
-    df_crawled['cleaned_title'] = df_crawled['title'].apply(clean_text)
-    df_crawled['cleaned_full_text'] = df_crawled['full_text'].apply(clean_text)
-    df_crawled['formatted_date'] = df_crawled['publish_date'].apply(format_date)
+    df_crawled['cleaned_title'] = clean_series(df_crawled['title'])
+    df_crawled['cleaned_full_text'] = clean_series(df_crawled['full_text'])
+    df_crawled['formatted_date'] = normalize_dates(df_crawled['publish_date'])
     df_crawled.dropna(subset=['formatted_date', 'full_text'], inplace=True)
     df_final = df_crawled.copy()
     print("\n[ANALISIS] Memulai proses analisis sentimen...")
@@ -3,33 +3,81 @@
 import re
 from datetime import datetime, timedelta
 import pandas as pd
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
-# Inisialisasi stopword remover
-try:
-    factory = StopWordRemoverFactory()
-    stopword_remover = factory.create_stop_word_remover()
-except Exception as e:
-    print(f"WARNING: Gagal inisialisasi Sastrawi. Stopword removal dilewati. Error: {e}")
-    stopword_remover = None
+from .tokenizer import SASTRAWI_STOPWORDS, stem_token
+
+# Naikkan setiap kali aturan pembersihan teks atau normalisasi tanggal
+# (dates.py) berubah: run_preprocessing lalu membangun ulang dataset master
+# dan mencoba lagi record yang pernah ditolak (lihat incremental.load_rejected)
+CLEANER_VERSION = 1
+
+# Teks bersih hanya membuang stopword Sastrawi; kata gaul proyek (mis. 'gak')
+# tetap disimpan karena berpengaruh pada sentimen
+STOPWORDS = SASTRAWI_STOPWORDS
+if not STOPWORDS:
+    print("WARNING: Sastrawi tidak tersedia. Stopword removal dilewati.")
+
+# Pola pembersihan dikompilasi sekali. Tidak ada pola yang melintasi whitespace,
+# jadi keduanya bisa dijalankan per kata; URL tetap dibuang lebih dulu, lalu
+# mention, hashtag, angka, dan tanda baca dalam satu pass (hasilnya sama dengan
+# pass terpisah pada versi lama).
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_TOKEN_PATTERN = re.compile(r'[@#]\w*|\d+|[^\w\s@#]+')
+
+
+def _clean_words(text):
+    """Lowercase lalu pecah per kata; kata yang seluruhnya huruf tidak perlu regex."""
+    words = []
+    for word in text.lower().split():
+        if not word.isalpha():
+            word = _TOKEN_PATTERN.sub('', _URL_PATTERN.sub('', word))
+            if not word:
+                continue
+        words.append(word)
+    return words
+
+
+def _remove_stopwords_compat(words):
+    """
+    Meniru StopWordRemover.remove milik Sastrawi persis, termasuk perilakunya
+    yang melewatkan kata setelah stopword yang dihapus (list diubah saat
+    diiterasi), tetapi dengan lookup frozenset alih-alih list.
+    """
+    for word in words:
+        if word in STOPWORDS:
+            words.remove(word)
+    return ' '.join(words)
+
+
+def _finish(words, exact=True, stem=False):
+    if exact and STOPWORDS:
+        return _remove_stopwords_compat(words)
+    words = [word for word in words if word not in STOPWORDS]
+    if stem:
+        words = [stem_token(word) for word in words]
+    return ' '.join(words)
+
 
 def clean_text(text):
     # Fungsi ini sudah solid
     if not isinstance(text, str): return ""
-    text = text.lower()
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'#\w+', '', text)
-    text = re.sub(r'\d+', '', text)
-    text = re.sub(r'[^\w\s]', '', text)
-    text = text.strip()
-    text = re.sub(r'\s+', ' ', text)
-    if stopword_remover:
-        try:
-            text = stopword_remover.remove(text)
-        except:
-            pass
-    return text
+    return _finish(_clean_words(text))
+
+
+def clean_series(texts, exact=False, stem=False):
+    """
+    Versi batch `clean_text` untuk seluruh Series/list; mengembalikan Series
+    dengan index yang sama. Secara default semua stopword dibuang; `exact=True`
+    menghasilkan output yang identik dengan `clean_text` (termasuk stopword
+    yang terlewat oleh Sastrawi). `stem=True` mengganti setiap kata dengan kata
+    dasarnya (stemmer Sastrawi dengan cache per token); diabaikan bila `exact`.
+    """
+    series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    cleaned = [
+        _finish(_clean_words(value), exact, stem) if isinstance(value, str) else ''
+        for value in series.tolist()
+    ]
+    return pd.Series(cleaned, index=series.index)
 
 def format_date(date_input):
     """
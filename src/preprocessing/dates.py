@@ -0,0 +1,154 @@
+# src/preprocessing/dates.py
+#
+# Normalisasi tanggal secara bulk, pengganti pemanggilan format_date per baris.
+# Setiap teks tanggal digolongkan ke satu keluarga format dengan satu regex,
+# lalu tiap keluarga di-parse sekaligus dengan pd.to_datetime berformat
+# eksplisit. Tanggal absolut dihitung sekali per teks unik; tanggal relatif
+# ("2 jam yang lalu", "kemarin") dihitung dari waktu crawl baris tersebut,
+# bukan dari waktu preprocessing dijalankan.
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+OUTPUT_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Zona waktu lokal sumber (WIB); waktu crawl (UTC) dikonversi ke sini sebelum
+# tanggal relatif dihitung, sama seperti jam "... WIB" pada berita
+DATE_TIMEZONE = os.getenv('DATE_TIMEZONE', 'Asia/Jakarta')
+
+MONTHS = {
+    'januari': 1, 'februari': 2, 'maret': 3, 'april': 4, 'mei': 5, 'juni': 6, 'juli': 7,
+    'agustus': 8, 'september': 9, 'oktober': 10, 'november': 11, 'desember': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'agu': 8,
+    'sep': 9, 'okt': 10, 'nov': 11, 'des': 12,
+}
+
+# Satu regex, satu grup bernama per keluarga format (dicocokkan pada teks lowercase)
+DATE_PATTERN = (
+    # ISO 8601 (YouTube, Twitter): zona waktu dibuang, jam dinding dipertahankan
+    r'^(?P<iso>\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2})?)?)(?:\.\d+)?(?:z|[+-]\d{2}:?\d{2})?$'
+    # Detik: "kamis, 16 okt 2025 19:00 wib" (nama hari opsional)
+    r'|^(?:[a-z]+,?\s+)?(?P<detik_day>\d{1,2})\s+(?P<detik_month>[a-z]+)\s+(?P<detik_year>\d{4})\s+(?P<detik_time>\d{1,2}:\d{2})\s+wib'
+    # Bola.net: "16 oktober 2025, 19:00"
+    r'|^(?P<bola_day>\d{1,2})\s+(?P<bola_month>[a-z]+)\s+(?P<bola_year>\d{4}),\s*(?P<bola_time>\d{1,2}:\d{2})'
+    # Kompas: "16 oktober 2025"
+    r'|^(?P<kompas_day>\d{1,2})\s+(?P<kompas_month>[a-z]+)\s+(?P<kompas_year>\d{4})$'
+    # Halaman daftar Kompas: "16/10/2025, 19:00 wib" (jam opsional)
+    r'|^(?P<numeric_day>\d{1,2})/(?P<numeric_month>\d{1,2})/(?P<numeric_year>\d{4})(?:,?\s*(?P<numeric_time>\d{1,2}:\d{2}))?(?:\s*wib)?$'
+    # Relatif: "2 jam yang lalu", "5 minutes lalu", "kemarin"
+    r'|(?P<rel_num>\d+)\s*(?P<rel_unit>jam|hour|menit|minute|hari|day)\D*lalu'
+    r'|(?P<kemarin>kemarin)'
+)
+
+_RELATIVE_UNITS = {'jam': 'h', 'hour': 'h', 'menit': 'min', 'minute': 'min', 'hari': 'D', 'day': 'D'}
+
+
+def _absolute(parts, family):
+    """Tanggal absolut satu keluarga (detik/bola/kompas/numeric) dari grup regex-nya."""
+    month = parts[f'{family}_month']
+    month = pd.to_numeric(month, errors='coerce').fillna(month.map(MONTHS))
+    text = (parts[f'{family}_year'] + '-' + month.astype('Int64').astype(str) + '-' + parts[f'{family}_day'])
+    if f'{family}_time' in parts:
+        # Jam yang tidak dicantumkan dianggap 00:00
+        time = parts[f'{family}_time'].fillna('00:00')
+        return pd.to_datetime(text + ' ' + time, format='%Y-%m-%d %H:%M', errors='coerce')
+    return pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+
+
+def _as_text(values, index):
+    """Series object berisi teks tanggal; NaT/NaN menjadi None."""
+    return pd.Series([value if isinstance(value, str) else None for value in values], index=index, dtype=object)
+
+
+def _parse_free_form(text):
+    # Format lain: serahkan ke parser umum pandas, seperti langkah pertama format_date
+    try:
+        return pd.to_datetime(text).strftime(OUTPUT_FORMAT)
+    except (ValueError, OverflowError, pd.errors.ParserError):
+        return None
+
+
+def _reference_times(crawled_at, index):
+    """Waktu crawl per baris (naive, zona DATE_TIMEZONE); kosong -> sekarang."""
+    now = pd.Timestamp(datetime.now().astimezone()).tz_convert(DATE_TIMEZONE).tz_localize(None)
+    if crawled_at is None:
+        return pd.Series(now, index=index)
+    reference = pd.to_datetime(pd.Series(crawled_at, index=index), utc=True, errors='coerce')
+    return reference.dt.tz_convert(DATE_TIMEZONE).dt.tz_localize(None).fillna(now)
+
+
+def normalize_dates(dates, crawled_at=None) -> pd.Series:
+    """
+    Versi bulk `cleaner.format_date`: mengembalikan Series teks 'YYYY-MM-DD HH:MM:SS'
+    (None bila gagal) dengan index yang sama dengan `dates`. `crawled_at`
+    (Series waktu crawl, UTC) menjadi acuan tanggal relatif; baris tanpa
+    waktu crawl memakai waktu sekarang.
+    """
+    dates = dates if isinstance(dates, pd.Series) else pd.Series(list(dates), dtype=object)
+    original_index = dates.index
+    # Bekerja dengan index posisi agar index duplikat tidak mengacaukan penempatan
+    dates = dates.reset_index(drop=True)
+    if crawled_at is not None:
+        crawled_at = pd.Series(list(crawled_at), dtype=object)
+    result = pd.Series(None, index=dates.index, dtype=object)
+    if dates.empty:
+        return _as_text(result, original_index)
+
+    is_text = dates.map(lambda value: isinstance(value, str))
+    is_datetime = dates.map(lambda value: isinstance(value, datetime))
+    if is_datetime.any():
+        result[is_datetime] = [value.strftime(OUTPUT_FORMAT) for value in dates[is_datetime]]
+
+    texts = dates[is_text].str.lower().str.strip()
+    if texts.empty:
+        return _as_text(result, original_index)
+
+    # Tanggal absolut: diklasifikasi dan di-parse sekali per teks unik
+    unique = pd.Series(texts.unique())
+    parts = unique.str.extract(DATE_PATTERN)
+    parsed = pd.Series(pd.NaT, index=unique.index, dtype='datetime64[ns]')
+    iso = parts['iso'].notna()
+    if iso.any():
+        parsed[iso] = pd.to_datetime(parts.loc[iso, 'iso'].str.replace('t', ' '), format='ISO8601', errors='coerce')
+    for family in ('detik', 'bola', 'kompas', 'numeric'):
+        matched = parts[f'{family}_year'].notna()
+        if matched.any():
+            parsed[matched] = _absolute(parts[matched], family)
+    formatted = _as_text(parsed.dt.strftime(OUTPUT_FORMAT), parsed.index)
+
+    # Teks yang tidak masuk keluarga mana pun di-parse satu per satu (tetap sekali per teks unik)
+    relative = parts['rel_num'].notna() | parts['kemarin'].notna()
+    unknown = parts.isna().all(axis=1)
+    for position in unknown[unknown].index:
+        formatted[position] = _parse_free_form(unique[position])
+    memo = dict(zip(unique, formatted))
+    result[texts.index] = texts.map(memo)
+
+    # Tanggal relatif: dihitung per baris terhadap waktu crawl-nya
+    relative_texts = set(unique[relative])
+    if relative_texts:
+        rows = texts[texts.isin(relative_texts)]
+        lookup = parts[relative].set_index(unique[relative])
+        reference = _reference_times(
+            crawled_at[rows.index] if crawled_at is not None else None, rows.index
+        )
+        number = pd.to_numeric(rows.map(lookup['rel_num']), errors='coerce')
+        unit = rows.map(lookup['rel_unit']).map(_RELATIVE_UNITS)
+        resolved = pd.Series(pd.NaT, index=rows.index, dtype='datetime64[ns]')
+        for code in ('h', 'min', 'D'):
+            selected = unit == code
+            if selected.any():
+                resolved[selected] = reference[selected] - pd.to_timedelta(number[selected], unit=code)
+        yesterday = rows.map(lookup['kemarin']).notna()
+        resolved[yesterday] = reference[yesterday] - pd.Timedelta(days=1)
+        # Seperti format_date: satuan hari hanya menyimpan tanggalnya
+        whole_days = (unit == 'D') | yesterday
+        resolved[whole_days] = resolved[whole_days].dt.normalize()
+        result[rows.index] = _as_text(resolved.dt.strftime(OUTPUT_FORMAT), rows.index)
+
+    failed = dates[is_text & result.isna()]
+    if not failed.empty:
+        examples = ', '.join(repr(value) for value in failed.unique()[:3])
+        print(f"  - WARNING: Gagal memformat {len(failed)} tanggal (mis. {examples})")
+    return _as_text(result, original_index)
@@ -0,0 +1,145 @@
+# src/preprocessing/incremental.py
+#
+# Preprocessing inkremental: setiap record mentah mendapat hash konten yang
+# stabil (source + url + full_text). Hanya hash yang belum ada di dataset
+# master yang diproses, lalu ditambahkan ke akhir file master. Versi cleaner
+# dicatat di file state; jika berbeda, master dibangun ulang dari awal.
+# Master selalu dibaca dan ditulis per potongan agar memori tidak bergantung
+# pada ukuran korpus.
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+MASTER_PATH = 'data/processed/master_cleaned_data.csv'
+STATE_PATH = 'data/processed/preprocessing_state.json'
+REJECTED_PATH = 'data/processed/rejected_hashes.json'
+HASH_FIELDS = ('source', 'url', 'full_text')
+MASTER_CHUNK_ROWS = 100_000     # baris per potongan saat membaca master
+
+
+def content_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash konten per baris (hex 32 karakter); kolom yang tidak ada/kosong dianggap ''."""
+    columns = [
+        df[field].tolist() if field in df.columns else [None] * len(df)
+        for field in HASH_FIELDS
+    ]
+    hashes = [
+        hashlib.blake2b(
+            '\x1f'.join(value if isinstance(value, str) else '' for value in values).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        for values in zip(*columns)
+    ]
+    return pd.Series(hashes, index=df.index, dtype=object)
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    state = dict(state, updated_at=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def load_rejected(cleaner_version: int, path: str = REJECTED_PATH) -> set:
+    """
+    content_hash record yang sudah diproses tetapi ditolak (mis. tanggal tidak
+    terbaca) oleh cleaner versi `cleaner_version`; versi lain -> himpunan kosong
+    sehingga record tersebut dicoba lagi dengan aturan baru.
+    """
+    stored = load_state(path)
+    if stored.get('cleaner_version') != cleaner_version:
+        return set()
+    return set(stored.get('hashes', []))
+
+
+def save_rejected(hashes, cleaner_version: int, path: str = REJECTED_PATH):
+    save_state({'cleaner_version': cleaner_version, 'hashes': sorted(hashes)}, path)
+
+
+def text_hashes(texts) -> list:
+    """Hash 64-bit teks lengkap (pengganti menyimpan teksnya untuk dedup lintas potongan)."""
+    return [
+        int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+        if isinstance(text, str) else None
+        for text in texts
+    ]
+
+
+def master_columns(path: str = MASTER_PATH):
+    """Header dataset master, atau None jika belum ada."""
+    return list(pd.read_csv(path, nrows=0).columns) if os.path.exists(path) else None
+
+
+def load_known(path: str = MASTER_PATH, chunk_rows: int = MASTER_CHUNK_ROWS):
+    """
+    (content_hash, hash teks) yang sudah ada di master, dibaca per potongan
+    dan hanya dua kolom; None jika master belum ada / dibuat sebelum ada
+    kolom content_hash.
+    """
+    columns = master_columns(path)
+    if not columns or 'content_hash' not in columns:
+        return None
+    known_hashes, known_texts = set(), set()
+    for chunk in pd.read_csv(path, usecols=['content_hash', 'full_text'], dtype=str, chunksize=chunk_rows):
+        known_hashes.update(chunk['content_hash'].dropna())
+        known_texts.update(text_hashes(chunk['full_text'].dropna()))
+    return known_hashes, known_texts
+
+
+def iter_master(path: str = MASTER_PATH, columns=None, chunk_rows: int = MASTER_CHUNK_ROWS):
+    yield from pd.read_csv(path, usecols=columns, dtype=str, chunksize=chunk_rows)
+
+
+class MasterWriter:
+    """
+    Menulis potongan hasil preprocessing ke master dengan urutan kolom tetap.
+    Mode `rebuild` menulis ke file sementara yang menggantikan master saat
+    `close` (master lama tetap utuh jika proses gagal di tengah jalan); mode
+    inkremental menambahkan baris ke akhir master tanpa menulis ulang baris
+    lama, sehingga resume run_analysis berbasis posisi tetap aman.
+    """
+
+    def __init__(self, columns, path: str = MASTER_PATH, rebuild: bool = False):
+        self.columns = list(columns)
+        self.path = path
+        self.rebuild = rebuild
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._target = path + '.tmp' if rebuild else path
+        if rebuild:
+            pd.DataFrame(columns=self.columns).to_csv(self._target, index=False)
+        else:
+            self._extend_columns()
+
+    def _extend_columns(self):
+        # Kolom baru (mis. dari CSV lama): master ditulis ulang sekali, per potongan
+        existing = master_columns(self.path)
+        if existing == self.columns:
+            return
+        tmp_path = self.path + '.tmp'
+        pd.DataFrame(columns=self.columns).to_csv(tmp_path, index=False)
+        for chunk in iter_master(self.path):
+            chunk.reindex(columns=self.columns).to_csv(tmp_path, mode='a', header=False, index=False)
+        os.replace(tmp_path, self.path)
+
+    def write(self, df: pd.DataFrame):
+        df.reindex(columns=self.columns).to_csv(self._target, mode='a', header=False, index=False)
+        self.count += len(df)
+
+    def close(self):
+        if self.rebuild:
+            os.replace(self._target, self.path)
@@ -0,0 +1,85 @@
+# src/preprocessing/language_filter.py
+
+import re
+import threading
+
+from langdetect import DetectorFactory, LangDetectException, detect
+from langdetect.detector_factory import init_factory
+
+# langdetect (classifier n-gram karakter) memakai sampling acak; seed tetap
+# membuat hasil deteksi selalu sama untuk teks yang sama
+DetectorFactory.seed = 0
+
+SHORT_TEXT_WORDS = 3        # teks sependek ini cukup memuat satu kata leksikon untuk dianggap 'id'
+LEXICON_RATIO = 0.5         # proporsi kata leksikon Indonesia yang langsung dianggap 'id'
+UNKNOWN = 'und'
+
+# Kata-kata Indonesia/gaul yang sangat sering muncul di komentar. Sengaja tanpa
+# kata topik yang juga dipakai komentar berbahasa lain (indonesia, garuda,
+# timnas, indo) dan kata yang juga kata Inggris/umum lintas bahasa (main, gas,
+# min, bang, gol, amin, allah), agar "indonesia will win" tetap ke langdetect
+INDONESIAN_LEXICON = frozenset("""
+ayo ayok mantap mantab mantul keren bagus hebat semangat sehat selalu
+menang kalah golnya kak
+terus lanjut jaya bangga sukses juara
+yang dan di ke dari ini itu aja saja juga sudah udah belum gak nggak tidak bisa
+banget sekali kita kami kamu aku gue pemain pelatih wasit nonton
+semoga lolos piala dunia akan harus lagi masih karena untuk dengan
+""".split())
+
+_WHITESPACE = re.compile(r'\s+')
+_LETTERS = re.compile(r'[^\W\d_]+')
+
+
+def normalize_text(text: str) -> str:
+    """Kunci cache: huruf kecil dan spasi dirapikan."""
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+class LanguageFilter:
+    """
+    Deteksi bahasa komentar secara batch dengan cache berdasarkan teks
+    ternormalisasi. Komentar tanpa huruf (emoji/angka saja) langsung 'und';
+    komentar yang memuat kata leksikon Indonesia (komentar sangat pendek) atau
+    sebagian besar katanya ada di leksikon langsung 'id'. Sisanya, termasuk
+    komentar pendek tanpa kata leksikon, tetap diklasifikasi langdetect.
+    """
+
+    def __init__(self, short_text_words: int = SHORT_TEXT_WORDS):
+        # Profil bahasa langdetect dimuat malas tanpa lock; dimuat di sini (thread
+        # utama) agar worker yang memanggil detect_batch bersamaan tidak merusaknya
+        init_factory()
+        self.short_text_words = short_text_words
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _classify(self, normalized: str) -> str:
+        words = _LETTERS.findall(normalized)
+        if not words:
+            return UNKNOWN
+        known = sum(w in INDONESIAN_LEXICON for w in words)
+        if known and (len(words) <= self.short_text_words or known / len(words) >= LEXICON_RATIO):
+            return 'id'
+        try:
+            return detect(normalized)
+        except LangDetectException:
+            return UNKNOWN
+
+    def detect_batch(self, texts):
+        """Mengembalikan kode bahasa untuk setiap teks; teks yang sama hanya diklasifikasi sekali."""
+        keys = [normalize_text(t) if isinstance(t, str) else '' for t in texts]
+        with self._lock:
+            missing = {k for k in keys if k not in self._cache}
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        results = {k: self._classify(k) for k in missing}
+        with self._lock:
+            self._cache.update(results)
+            return [self._cache[k] for k in keys]
+
+    def filter(self, records, lang: str = 'id', key: str = 'full_text'):
+        """Menyaring list dict, hanya menyisakan record berbahasa `lang`."""
+        langs = self.detect_batch([r.get(key, '') for r in records])
+        return [r for r, detected in zip(records, langs) if detected == lang]
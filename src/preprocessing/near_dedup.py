@@ -0,0 +1,186 @@
+# src/preprocessing/near_dedup.py
+#
+# Deteksi near-duplicate dengan shingling + MinHash + LSH banding: artikel
+# sindikasi yang hanya beda byline, hasil pencarian Detik yang menunjuk ke
+# situs saudara, dan komentar spam hasil copy-paste. Setiap dokumen hanya
+# dibandingkan dengan kandidat yang berbagi bucket LSH, sehingga waktunya
+# kurang lebih linear terhadap ukuran korpus. Index dipersist agar baris baru
+# bisa dicek terhadap seluruh data lama secara inkremental.
+
+import os
+import zlib
+
+import numpy as np
+
+NEAR_DUP_INDEX_PATH = 'data/state/near_dup_index.npz'
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.8'))  # ambang Jaccard
+NUM_PERM = 128          # panjang signature MinHash
+SHINGLE_SIZE = 3        # shingle = 3 kata berurutan
+MINHASH_SEED = 1
+# Kandidat LSH selalu diverifikasi dengan signature penuh, jadi false positive
+# hanya biaya komputasi; false negative berarti duplikat lolos
+LSH_FALSE_NEGATIVE_WEIGHT = 0.9
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz   # numpy < 2.0
+
+
+def _permutations(num_perm: int, seed: int = MINHASH_SEED):
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE):
+    """Shingle kata; teks yang lebih pendek dari `size` kata menjadi satu shingle."""
+    words = text.split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def optimal_bands(threshold: float, num_perm: int = NUM_PERM):
+    """
+    Pasangan (bands, rows) dengan bands * rows <= num_perm yang meminimalkan
+    luas false positive (di bawah ambang) + false negative (di atas ambang,
+    diberi bobot LSH_FALSE_NEGATIVE_WEIGHT) dari peluang menjadi kandidat,
+    1 - (1 - s^rows)^bands.
+    """
+    below = np.linspace(0, threshold, 200)
+    above = np.linspace(threshold, 1, 200)
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _trapezoid(1 - (1 - below ** rows) ** bands, below)
+            false_negative = _trapezoid((1 - above ** rows) ** bands, above)
+            error = ((1 - LSH_FALSE_NEGATIVE_WEIGHT) * false_positive
+                     + LSH_FALSE_NEGATIVE_WEIGHT * false_negative)
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """Menghitung signature MinHash; hash shingle memakai crc32 agar stabil antar proses."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = MINHASH_SEED):
+        self.num_perm = num_perm
+        self._a, self._b = _permutations(num_perm, seed)
+
+    def signature(self, text: str):
+        """Signature uint32[num_perm], atau None untuk teks kosong."""
+        items = shingles(text) if isinstance(text, str) else set()
+        if not items:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in items), dtype=np.uint64, count=len(items))
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    Index LSH berisi signature dokumen unik (kunci = content_hash). `dropped`
+    menyimpan content_hash yang pernah dibuang sebagai duplikat agar tidak
+    diproses ulang pada run berikutnya. `empty_keys` mencatat dokumen tanpa
+    shingle (tidak punya signature) agar tidak dianggap tertinggal dari master.
+    """
+
+    def __init__(self, path: str = NEAR_DUP_INDEX_PATH, threshold: float = NEAR_DUP_THRESHOLD,
+                 num_perm: int = NUM_PERM, load: bool = True):
+        self.path = path
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.keys = []
+        self.dropped = set()
+        self.empty_keys = set()
+        self._signatures = []
+        self._buckets = [{} for _ in range(self.bands)]
+        self.loaded = False
+        if load and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _load(self):
+        stored = np.load(self.path, allow_pickle=False)
+        # Index dengan parameter berbeda tidak bisa dipakai; pemanggil membangun ulang
+        if float(stored['threshold']) != self.threshold or stored['signatures'].shape[1:] != (self.hasher.num_perm,):
+            return
+        for key, signature in zip(stored['keys'].tolist(), stored['signatures']):
+            self._insert(key, signature)
+        self.dropped = set(stored['dropped'].tolist())
+        if 'empty_keys' in stored.files:
+            self.empty_keys = set(stored['empty_keys'].tolist())
+        self.loaded = True
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, key, signature):
+        position = len(self.keys)
+        self.keys.append(key)
+        self._signatures.append(signature)
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(position)
+
+    def query(self, signature):
+        """content_hash dokumen paling mirip dengan estimasi Jaccard >= threshold, atau None."""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        best, best_score = None, self.threshold
+        for position in candidates:
+            score = float(np.mean(self._signatures[position] == signature))
+            if score >= best_score:
+                best, best_score = self.keys[position], score
+        return best
+
+    def add(self, key, text):
+        """Memasukkan dokumen ke index tanpa pengecekan (mis. mengisi ulang dari master)."""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            self.empty_keys.add(key)
+        else:
+            self._insert(key, signature)
+
+    def check_and_add(self, key, text):
+        """
+        Mengembalikan content_hash dokumen yang diduplikasi oleh `text`, atau
+        None jika unik (dokumen unik langsung dimasukkan ke index).
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            self.empty_keys.add(key)
+            return None
+        duplicate_of = self.query(signature)
+        if duplicate_of is None:
+            self._insert(key, signature)
+        else:
+            self.dropped.add(key)
+        return duplicate_of
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        signatures = (np.vstack(self._signatures) if self._signatures
+                      else np.empty((0, self.hasher.num_perm), dtype=np.uint32))
+        tmp_path = self.path + '.tmp.npz'
+        np.savez_compressed(
+            tmp_path, signatures=signatures, keys=np.array(self.keys, dtype=str),
+            dropped=np.array(sorted(self.dropped), dtype=str),
+            empty_keys=np.array(sorted(self.empty_keys), dtype=str), threshold=np.float64(self.threshold),
+        )
+        os.replace(tmp_path, self.path)
+
+
+def find_near_duplicates(texts, keys, index: NearDuplicateIndex):
+    """
+    Menandai near-duplicate secara berurutan: setiap teks dicek terhadap index
+    (data lama + teks sebelumnya di batch ini). Mengembalikan list berisi
+    content_hash dokumen asli untuk baris duplikat, None untuk baris unik.
+    """
+    return [index.check_and_add(key, text) for key, text in zip(keys, texts)]
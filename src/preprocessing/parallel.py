@@ -0,0 +1,78 @@
+# src/preprocessing/parallel.py
+#
+# Pembersihan teks + format tanggal di banyak core. DataFrame dipecah menjadi
+# potongan berurutan yang diproses oleh process pool; pool.map mengembalikan
+# hasil sesuai urutan input sehingga urutan baris tidak berubah.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .cleaner import clean_series
+from .dates import normalize_dates
+
+PARALLEL_MIN_ROWS = 5000    # di bawah ini diproses serial (biaya start pool tidak sepadan)
+CHUNK_ROWS = 2000           # baris per tugas worker
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+
+def _init_worker(stem):
+    # Sumber daya Sastrawi dibuat sekali per worker: daftar stopword dimuat saat
+    # cleaner diimpor, stemmer (yang mahal) hanya bila diperlukan
+    if stem:
+        from .tokenizer import _get_stemmer
+        _get_stemmer()
+
+
+def _process_chunk(task):
+    texts, dates, crawled_at, exact, stem = task
+    cleaned = clean_series(texts, exact=exact, stem=stem).tolist()
+    formatted = normalize_dates(dates, crawled_at).tolist()
+    return cleaned, formatted
+
+
+def make_pool(workers: int, stem: bool = False):
+    """
+    Process pool untuk preprocess_columns, dibuat sekali per run dan dipakai
+    ulang untuk semua potongan (inisialisasi worker hanya sekali); None jika
+    `workers` <= 1. Pemanggil wajib memanggil `shutdown()`.
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stem,))
+
+
+def preprocess_columns(texts: pd.Series, dates: pd.Series, crawled_at: pd.Series = None, workers: int = 1,
+                       exact: bool = False, stem: bool = False, min_rows: int = PARALLEL_MIN_ROWS, pool=None):
+    """
+    Mengembalikan (cleaned_full_text, formatted_date) sebagai Series dengan
+    index yang sama dengan `texts`. `crawled_at` menjadi acuan tanggal relatif
+    (lihat dates.normalize_dates). Dengan `workers` > 1 (atau `pool` dari
+    make_pool) dan data minimal `min_rows` baris, pekerjaan dibagi ke process
+    pool; tanpa `pool`, pool sementara dibuat untuk panggilan ini saja.
+    """
+    text_values = texts.tolist()
+    date_values = dates.tolist()
+    crawl_values = crawled_at.tolist() if crawled_at is not None else [None] * len(text_values)
+    if (pool is None and workers <= 1) or len(text_values) < min_rows:
+        cleaned, formatted = _process_chunk((text_values, date_values, crawl_values, exact, stem))
+    else:
+        tasks = [
+            (text_values[start:start + CHUNK_ROWS], date_values[start:start + CHUNK_ROWS],
+             crawl_values[start:start + CHUNK_ROWS], exact, stem)
+            for start in range(0, len(text_values), CHUNK_ROWS)
+        ]
+        cleaned, formatted = [], []
+        owned = pool is None
+        if owned:
+            pool = make_pool(workers, stem)
+        try:
+            for chunk_cleaned, chunk_formatted in pool.map(_process_chunk, tasks):
+                cleaned.extend(chunk_cleaned)
+                formatted.extend(chunk_formatted)
+        finally:
+            if owned:
+                pool.shutdown()
+    return (pd.Series(cleaned, index=texts.index, dtype=object),
+            pd.Series(formatted, index=texts.index, dtype=object))
@@ -0,0 +1,180 @@
+# src/preprocessing/token_matrix.py
+#
+# Korpus ter-tokenisasi hasil preprocessing: kosakata + matriks dokumen-term
+# berformat CSR (id token int32) yang baris-barisnya sejajar dengan
+# content_hash di dataset master.
+#   data/processed/tokens/vocab.txt        -> satu token per baris (id = nomor baris)
+#   data/processed/tokens/part-00000.npz   -> keys, indptr, indices, data per potongan
+# Frekuensi kata untuk subset baris mana pun cukup berupa slice baris + jumlah
+# per kolom, tanpa memecah ulang string. Hanya butuh numpy (+ pandas untuk
+# lookup key) sehingga bisa dipakai dashboard tanpa scipy.
+
+import glob
+import os
+import shutil
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+TOKEN_MATRIX_DIR = 'data/processed/tokens'
+VOCAB_FILE = 'vocab.txt'
+
+
+def _load_vocab(directory: str):
+    path = os.path.join(directory, VOCAB_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return f.read().split('\n')[:-1]
+
+
+def matrix_version(directory: str = TOKEN_MATRIX_DIR):
+    """
+    Sidik artefak di `directory` (nama, mtime, ukuran setiap file): berubah
+    setiap kali run_preprocessing menambah part atau membangun ulang folder.
+    Murah (hanya stat), cocok sebagai kunci cache.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, 'part-*.npz')) + [os.path.join(directory, VOCAB_FILE)])
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        version.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+class TokenMatrixWriter:
+    """
+    Menulis token `cleaned_full_text` per potongan, berpasangan dengan
+    MasterWriter: mode `rebuild` menulis ke folder sementara yang
+    menggantikan folder lama saat `close`; mode inkremental menambah part
+    baru dan token baru di akhir kosakata (id token lama tidak berubah).
+    """
+
+    def __init__(self, directory: str = TOKEN_MATRIX_DIR, rebuild: bool = False):
+        self.directory = directory
+        self.rebuild = rebuild
+        self._target = directory + '.tmp' if rebuild else directory
+        if rebuild:
+            shutil.rmtree(self._target, ignore_errors=True)
+        os.makedirs(self._target, exist_ok=True)
+        self._vocab = {token: i for i, token in enumerate(_load_vocab(self._target))}
+        self._parts = len(glob.glob(os.path.join(self._target, 'part-*.npz')))
+
+    @property
+    def empty(self) -> bool:
+        return self._parts == 0
+
+    def write(self, keys, texts):
+        indptr, indices, data, new_tokens = [0], [], [], []
+        for text in texts:
+            counts = Counter(text.split()) if isinstance(text, str) else {}
+            for token, count in counts.items():
+                token_id = self._vocab.get(token)
+                if token_id is None:
+                    token_id = self._vocab[token] = len(self._vocab)
+                    new_tokens.append(token)
+                indices.append(token_id)
+                data.append(count)
+            indptr.append(len(indices))
+
+        # Kosakata ditulis sebelum part yang merujuknya
+        if new_tokens:
+            with open(os.path.join(self._target, VOCAB_FILE), 'a', encoding='utf-8') as f:
+                f.write('\n'.join(new_tokens) + '\n')
+        path = os.path.join(self._target, f'part-{self._parts:05d}.npz')
+        np.savez_compressed(
+            path, keys=np.array(list(keys), dtype=str), indptr=np.array(indptr, dtype=np.int64),
+            indices=np.array(indices, dtype=np.int32), data=np.array(data, dtype=np.int32),
+        )
+        self._parts += 1
+
+    def close(self):
+        if self.rebuild:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.replace(self._target, self.directory)
+
+
+class TokenMatrix:
+    """Matriks dokumen-term CSR read-only beserta kosakata dan key barisnya."""
+
+    def __init__(self, vocab, keys, indptr, indices, data):
+        self.vocab = np.array(vocab, dtype=object)
+        self.keys = pd.Index(keys)
+        # content_hash bisa tercatat lebih dari sekali (teksnya identik): lookup memakai kemunculan pertama
+        first = ~self.keys.duplicated()
+        self._lookup = self.keys[first]
+        self._lookup_rows = np.flatnonzero(first)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._token_lengths = np.fromiter((len(token) for token in vocab), dtype=np.int32, count=len(vocab))
+        self._token_ids = {token: i for i, token in enumerate(vocab)}
+
+    @classmethod
+    def load(cls, directory: str = TOKEN_MATRIX_DIR):
+        """Memuat semua part; None jika artefak belum dibuat."""
+        parts = sorted(glob.glob(os.path.join(directory, 'part-*.npz')))
+        if not parts:
+            return None
+        keys, indptrs, indices, data = [], [], [], []
+        offset = 0
+        for path in parts:
+            with np.load(path, allow_pickle=False) as part:
+                keys.append(part['keys'])
+                indptrs.append(part['indptr'][1:] + offset)
+                indices.append(part['indices'])
+                data.append(part['data'])
+                offset += len(part['indices'])
+        indptr = np.concatenate([np.zeros(1, dtype=np.int64)] + indptrs)
+        return cls(_load_vocab(directory), np.concatenate(keys), indptr,
+                   np.concatenate(indices), np.concatenate(data))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows_for(self, keys):
+        """Posisi baris untuk daftar content_hash (key yang tidak ada diabaikan)."""
+        positions = self._lookup.get_indexer(pd.Index(keys))
+        return self._lookup_rows[positions[positions >= 0]]
+
+    def term_counts(self, rows=None):
+        """Jumlah kemunculan setiap token (panjang = ukuran kosakata) untuk `rows` (None = semua)."""
+        if rows is None:
+            indices, data = self.indices, self.data
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            starts = self.indptr[rows]
+            lengths = self.indptr[rows + 1] - starts
+            # Posisi semua entri milik baris terpilih, tanpa loop Python
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            positions = offsets + np.arange(lengths.sum())
+            indices, data = self.indices[positions], self.data[positions]
+        return np.bincount(indices, weights=data, minlength=len(self.vocab)).astype(np.int64)
+
+    def _mask(self, stopwords, min_length):
+        mask = self._token_lengths >= min_length
+        stop_ids = [self._token_ids[token] for token in stopwords if token in self._token_ids]
+        mask[stop_ids] = False
+        return mask
+
+    def top_terms(self, n: int = 15, rows=None, stopwords=(), min_length: int = 1):
+        """[(token, jumlah)] terbanyak, setara Counter(tokenize(...)).most_common(n)."""
+        counts = np.where(self._mask(stopwords, min_length), self.term_counts(rows), 0)
+        n = min(n, int(np.count_nonzero(counts)))
+        if n == 0:
+            return []
+        top = np.argpartition(-counts, n - 1)[:n]
+        top = top[np.lexsort((top, -counts[top]))]
+        return [(self.vocab[i], int(counts[i])) for i in top]
+
+    def frequencies(self, rows=None, stopwords=(), min_length: int = 1, limit: int = None):
+        """Dict token -> jumlah (mis. untuk WordCloud.generate_from_frequencies)."""
+        if limit is not None:
+            return dict(self.top_terms(limit, rows, stopwords, min_length))
+        counts = np.where(self._mask(stopwords, min_length), self.term_counts(rows), 0)
+        nonzero = np.flatnonzero(counts)
+        return dict(zip(self.vocab[nonzero], counts[nonzero].tolist()))
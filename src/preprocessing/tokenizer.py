@@ -0,0 +1,64 @@
+# src/preprocessing/tokenizer.py
+
+from functools import lru_cache
+
+# Sastrawi opsional: dashboard (requirements.txt) hanya butuh daftar stopword tambahan
+try:
+    from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+    SASTRAWI_STOPWORDS = frozenset(StopWordRemoverFactory().get_stop_words())
+except ImportError:
+    SASTRAWI_STOPWORDS = frozenset()
+
+STEM_CACHE_SIZE = 100_000   # kosakata Zipfian: sebagian kecil token mendominasi
+
+# Kata gaul/noise yang sering muncul di berita & komentar tetapi tidak informatif.
+# Baris kedua sudah ada di daftar Sastrawi, diulang agar dashboard tetap
+# menyaringnya saat Sastrawi tidak terpasang.
+PROJECT_STOPWORDS = frozenset("""
+yg gak ga nya aja sama baca kata vs detik com
+yang ini itu dari untuk pada adalah dengan juga akan namun
+""".split())
+
+# Kata topik crawling yang muncul di hampir setiap dokumen (tidak informatif
+# untuk grafik kata kunci dan word cloud)
+TOPIC_WORDS = frozenset("""
+timnas indonesia garuda piala dunia tim skuad
+""".split())
+
+STOPWORDS = SASTRAWI_STOPWORDS | PROJECT_STOPWORDS
+
+_STEMMER = None
+
+
+def _get_stemmer():
+    global _STEMMER
+    if _STEMMER is None:
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+        _STEMMER = StemmerFactory().create_stemmer()
+    return _STEMMER
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem_token(token: str) -> str:
+    """Kata dasar satu token (stemmer Sastrawi), di-cache per token."""
+    return _get_stemmer().stem(token)
+
+
+def tokenize(text, stopwords=STOPWORDS, min_length: int = 1, stem: bool = False):
+    """
+    Memecah teks (yang sudah dibersihkan) menjadi token dalam satu pass:
+    lowercase, buang stopword dan token lebih pendek dari `min_length`, lalu
+    opsional di-stem. Stopword dicek sebelum dan sesudah stemming.
+    """
+    if not isinstance(text, str):
+        return []
+    tokens = []
+    for token in text.lower().split():
+        if len(token) < min_length or token in stopwords:
+            continue
+        if stem:
+            token = stem_token(token)
+            if not token or token in stopwords:
+                continue
+        tokens.append(token)
+    return tokens
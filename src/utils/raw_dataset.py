@@ -0,0 +1,245 @@
+# src/utils/raw_dataset.py
+#
+# Dataset mentah berformat Parquet, dipartisi per sumber dan tanggal crawl:
+#   data/raw/dataset/source_type=youtube/crawl_date=2025-01-31/part-....parquet
+# Setiap flush menulis file baru (Parquet tidak bisa di-append), sehingga
+# crawling inkremental cukup menambah file di partisi hari itu.
+#
+# Usage (memindahkan CSV lama ke dataset):
+#   python -m src.utils.raw_dataset --import-csv data/raw/youtube_comments_raw.csv --source-type youtube
+
+import argparse
+import glob
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+RAW_DATASET_DIR = 'data/raw/dataset'
+FLUSH_EVERY = 1000          # jumlah record per file Parquet
+
+# Kolom partisi (disimpan sebagai nama folder, bukan di dalam file)
+PARTITION_SCHEMA = pa.schema([
+    ('source_type', pa.string()),
+    ('crawl_date', pa.string()),
+])
+
+# Skema eksplisit isi file; kolom yang tidak ada di record diisi null
+FILE_SCHEMA = pa.schema([
+    ('item_id', pa.string()),           # ID tweet/komentar, kosong untuk berita
+    ('title', pa.string()),
+    ('url', pa.string()),
+    ('publish_date', pa.string()),      # teks tanggal mentah dari sumber
+    ('source', pa.string()),
+    ('author', pa.string()),
+    ('full_text', pa.string()),
+    ('likes', pa.int64()),
+    ('comments', pa.int64()),
+    ('shares', pa.int64()),
+    ('crawler', pa.string()),
+    ('keyword', pa.string()),
+    ('crawled_at', pa.timestamp('us', tz='UTC')),
+])
+RAW_SCHEMA = pa.unify_schemas([FILE_SCHEMA, PARTITION_SCHEMA])
+_INT_FIELDS = {field.name for field in FILE_SCHEMA if pa.types.is_integer(field.type)}
+_STRING_FIELDS = {field.name for field in FILE_SCHEMA if pa.types.is_string(field.type)}
+
+# dtype pandas saat membaca data mentah: kolom berulang bernilai sedikit sebagai
+# category, angka interaksi nullable, teks lain sebagai string berbasis Arrow
+READ_CHUNK_ROWS = 50_000
+STRING_DTYPE = pd.StringDtype('pyarrow')
+CATEGORY_FIELDS = ('source_type', 'source', 'author', 'crawler', 'keyword')
+
+
+def _coerce(name, value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if name in _INT_FIELDS:
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+    if name in _STRING_FIELDS:
+        return str(value)
+    return value
+
+
+class RawDatasetWriter:
+    """
+    Menulis record mentah ke dataset Parquet terpartisi. Antarmukanya sama
+    dengan CsvSink (`write`, `close`, `count`) sehingga bisa dipakai sebagai
+    sink pipeline crawling. `source_type` dipakai untuk record yang tidak
+    membawa kolom tersebut (mis. artikel berita).
+    """
+
+    def __init__(self, source_type: str, root: str = RAW_DATASET_DIR, flush_every: int = FLUSH_EVERY):
+        self.source_type = source_type
+        self.root = root
+        self.flush_every = flush_every
+        self.count = 0
+        self._buffers = {}
+
+    def write(self, record: dict):
+        crawled_at = record.get('crawled_at') or datetime.now(timezone.utc)
+        source_type = record.get('source_type')
+        if not isinstance(source_type, str) or not source_type:
+            source_type = self.source_type
+        key = (source_type, crawled_at.strftime('%Y-%m-%d'))
+        row = {name: _coerce(name, record.get(name)) for name in FILE_SCHEMA.names}
+        row['crawled_at'] = crawled_at
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(row)
+        self.count += 1
+        if len(buffer) >= self.flush_every:
+            self._flush(key)
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def _flush(self, key):
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        source_type, crawl_date = key
+        directory = os.path.join(self.root, f'source_type={source_type}', f'crawl_date={crawl_date}')
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{datetime.now(timezone.utc):%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = os.path.join(directory, '.' + name + '.tmp')
+        pq.write_table(pa.Table.from_pylist(rows, schema=FILE_SCHEMA), tmp_path, compression='zstd')
+        # Rename atomik agar pembaca tidak pernah melihat file setengah jadi
+        os.replace(tmp_path, os.path.join(directory, name))
+
+    def close(self):
+        for key in list(self._buffers):
+            self._flush(key)
+
+
+def raw_dataset(root: str = RAW_DATASET_DIR):
+    return ds.dataset(
+        root, format='parquet', schema=RAW_SCHEMA,
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+        # File sementara (.part-*.tmp) yang sedang ditulis diabaikan
+        ignore_prefixes=['.', '_'],
+    )
+
+
+def read_raw_dataset(root: str = RAW_DATASET_DIR, source_types=None, start_date: str = None,
+                     end_date: str = None, columns=None) -> pd.DataFrame:
+    """
+    Membaca dataset mentah sebagai DataFrame. Filter `source_types` dan rentang
+    tanggal crawl (`start_date`/`end_date`, 'YYYY-MM-DD', inklusif) diterapkan
+    pada partisi, jadi folder yang tidak cocok tidak dibaca sama sekali.
+    """
+    if not os.path.isdir(root):
+        empty = RAW_SCHEMA.empty_table()
+        return (empty.select(columns) if columns else empty).to_pandas()
+
+    condition = None
+    if source_types:
+        condition = ds.field('source_type').isin(list(source_types))
+    for expr in (
+        ds.field('crawl_date') >= start_date if start_date else None,
+        ds.field('crawl_date') <= end_date if end_date else None,
+    ):
+        if expr is not None:
+            condition = expr if condition is None else condition & expr
+    return raw_dataset(root).to_table(columns=columns, filter=condition).to_pandas()
+
+
+def to_raw_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Menerapkan dtype data mentah pada kolom yang ada (kolom lain dibiarkan)."""
+    for column in df.columns:
+        if column in CATEGORY_FIELDS:
+            df[column] = df[column].astype(STRING_DTYPE).astype('category')
+        elif column in _INT_FIELDS:
+            df[column] = pd.to_numeric(df[column], errors='coerce').round().astype('Int64')
+        elif column == 'crawled_at':
+            df[column] = pd.to_datetime(df[column], utc=True, errors='coerce')
+        else:
+            df[column] = df[column].astype(STRING_DTYPE)
+    return df
+
+
+def iter_raw_dataset(root: str = RAW_DATASET_DIR, chunk_rows: int = READ_CHUNK_ROWS, columns=None):
+    """
+    Membaca dataset mentah per potongan +/- `chunk_rows` baris (DataFrame
+    bertipe, lihat to_raw_frame). Memori sebanding ukuran potongan, bukan
+    ukuran dataset.
+    """
+    if not os.path.isdir(root):
+        return
+    pending, pending_rows = [], 0
+    for batch in raw_dataset(root).to_batches(columns=columns, batch_size=chunk_rows):
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_rows:
+            yield to_raw_frame(pa.Table.from_batches(pending).to_pandas(types_mapper=pd.ArrowDtype))
+            pending, pending_rows = [], 0
+    if pending_rows:
+        yield to_raw_frame(pa.Table.from_batches(pending).to_pandas(types_mapper=pd.ArrowDtype))
+
+
+def iter_raw_csv(path: str, chunk_rows: int = READ_CHUNK_ROWS):
+    """Membaca CSV mentah lama per potongan dengan dtype yang sama seperti dataset."""
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=str):
+        yield to_raw_frame(chunk)
+
+
+def replace_full_text(texts: dict, key=None, root: str = RAW_DATASET_DIR, source_type: str = 'news') -> int:
+    """
+    Mengganti `full_text` record `source_type` yang URL-nya (setelah `key(url)`,
+    mis. canonical_url) ada di `texts`. Hanya file Parquet yang isinya berubah
+    yang ditulis ulang, masing-masing secara atomik. Mengembalikan jumlah
+    record yang berubah.
+    """
+    key = key or (lambda url: url)
+    changed = 0
+    pattern = os.path.join(root, f'source_type={source_type}', 'crawl_date=*', 'part-*.parquet')
+    for path in sorted(glob.glob(pattern)):
+        table = pq.ParquetFile(path).read()
+        old_texts = table.column('full_text').to_pylist()
+        new_texts = [
+            texts.get(key(url), text) if isinstance(url, str) else text
+            for url, text in zip(table.column('url').to_pylist(), old_texts)
+        ]
+        file_changed = sum(old != new for old, new in zip(old_texts, new_texts))
+        if not file_changed:
+            continue
+        table = table.set_column(table.schema.get_field_index('full_text'), 'full_text',
+                                 pa.array(new_texts, type=pa.string()))
+        tmp_path = os.path.join(os.path.dirname(path), '.' + os.path.basename(path) + '.tmp')
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+        changed += file_changed
+    return changed
+
+
+def import_csv(path: str, source_type: str, root: str = RAW_DATASET_DIR) -> int:
+    """Memindahkan isi CSV mentah lama ke dataset (tanggal crawl = waktu modifikasi file)."""
+    crawled_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    writer = RawDatasetWriter(source_type, root=root)
+    for chunk in pd.read_csv(path, chunksize=FLUSH_EVERY, dtype=str):
+        for record in chunk.to_dict('records'):
+            record['crawled_at'] = crawled_at
+            writer.write(record)
+    writer.close()
+    return writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utilitas dataset mentah Parquet.")
+    parser.add_argument("--import-csv", required=True, help="File CSV mentah yang akan dipindahkan.")
+    parser.add_argument("--source-type", required=True, help="Nilai source_type untuk record CSV (mis. news, youtube).")
+    parser.add_argument("--root", default=RAW_DATASET_DIR)
+    args = parser.parse_args()
+    written = import_csv(args.import_csv, args.source_type, args.root)
+    print(f"[SUCCESS] {written} record dari '{args.import_csv}' ditulis ke '{args.root}'.")
+
+
+if __name__ == '__main__':
+    main()
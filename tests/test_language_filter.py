@@ -0,0 +1,26 @@
+# tests/test_language_filter.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.preprocessing.language_filter import LanguageFilter
+
+SHORT_ENGLISH = ['indonesia will win', 'I love indonesia', 'the main problem', 'what a goal min']
+SHORT_INDONESIAN = ['mantap', 'semangat terus bro', 'keren banget', 'timnas kalah lagi', 'sangat memalukan']
+
+
+def test_short_english_comments_are_not_indonesian():
+    langs = LanguageFilter().detect_batch(SHORT_ENGLISH)
+    assert 'id' not in langs, dict(zip(SHORT_ENGLISH, langs))
+
+
+def test_short_indonesian_comments_are_kept():
+    assert LanguageFilter().detect_batch(SHORT_INDONESIAN) == ['id'] * len(SHORT_INDONESIAN)
+
+
+def test_concurrent_first_calls_agree_with_serial():
+    texts = [f'this is an english comment about the match number {i} and the referee' for i in range(64)]
+    language_filter = LanguageFilter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        concurrent = [lang for batch in pool.map(language_filter.detect_batch, ([t] for t in texts)) for lang in batch]
+    assert concurrent == LanguageFilter().detect_batch(texts)
+    assert set(concurrent) == {'en'}
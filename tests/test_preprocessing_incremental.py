@@ -0,0 +1,37 @@
+# tests/test_preprocessing_incremental.py
+
+import sys
+
+import pandas as pd
+
+import run_preprocessing
+
+RAW_ROWS = [
+    {'url': 'u1', 'title': 'a', 'publish_date': '16 Okt 2025', 'source_type': 'news',
+     'full_text': 'timnas garuda menang besar di stadion utama gelora bung karno malam ini'},
+    {'url': 'u2', 'title': 'b', 'publish_date': '16 Okt 2025', 'source_type': 'news',
+     'full_text': 'pelatih baru timnas memanggil pemain muda untuk laga kualifikasi berikutnya'},
+    # Tanpa tanggal: ditolak cleaner dan dicatat di rejected_hashes
+    {'url': 'u3', 'title': 'c', 'publish_date': '', 'source_type': 'news',
+     'full_text': 'suporter memenuhi stadion walau hujan deras sejak sore hari'},
+]
+
+
+def _run(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['run_preprocessing.py'])
+    run_preprocessing.main()
+
+
+def test_noop_run_does_not_rescan_master(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data' / 'raw').mkdir(parents=True)
+    pd.DataFrame(RAW_ROWS).to_csv(tmp_path / 'data' / 'raw' / 'berita.csv', index=False)
+    _run(monkeypatch)
+    assert len(pd.read_csv(run_preprocessing.MASTER_PATH)) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError('master dibaca ulang pada run tanpa data baru')
+
+    monkeypatch.setattr(run_preprocessing, 'iter_master', fail)
+    _run(monkeypatch)
+    assert len(pd.read_csv(run_preprocessing.MASTER_PATH)) == 2
@@ -0,0 +1,16 @@
+# tests/test_token_matrix.py
+
+import numpy as np
+
+from src.preprocessing.token_matrix import TokenMatrix
+
+
+def test_rows_for_with_duplicate_keys():
+    # Baris 0 dan 2 berkunci sama (teks identik tertulis dua kali)
+    matrix = TokenMatrix(
+        ['garuda', 'menang'], ['h1', 'h2', 'h1'],
+        indptr=np.array([0, 2, 3, 5]), indices=np.array([0, 1, 1, 0, 1]), data=np.array([1, 1, 2, 1, 1]),
+    )
+    rows = matrix.rows_for(['h2', 'h1', 'h3'])
+    assert rows.tolist() == [1, 0]
+    assert matrix.top_terms(rows=rows) == [('menang', 3), ('garuda', 1)]
@@ -0,0 +1,75 @@
+# tests/test_youtube_sync.py
+
+import crawl_youtube as cy
+from src.crawlers.youtube_quota import QuotaBudget
+from src.crawlers.youtube_state import VideoSyncState
+
+PAGE_SIZE = 100
+
+
+class StubService:
+    """Stub `commentThreads().list(...).execute()` dengan komentar urut terbaru dulu."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.calls = []
+
+    def add(self, count: int):
+        self.count += count
+
+    def commentThreads(self):
+        return self
+
+    def list(self, pageToken=None, order=None, **kwargs):
+        self.calls.append({'pageToken': pageToken, 'order': order})
+        start = int(pageToken or 0)
+        # Komentar ke-i dibuat pada detik ke-i; halaman pertama berisi yang terbaru
+        numbers = range(self.count - 1 - start, max(self.count - 1 - start - PAGE_SIZE, -1), -1)
+        items = [{'snippet': {'topLevelComment': {'id': f'c{i}', 'snippet': {
+            'publishedAt': f'2026-01-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z',
+            'textDisplay': f'komentar {i}',
+        }}}} for i in numbers]
+        response = {'items': items}
+        if start + PAGE_SIZE < self.count:
+            response['nextPageToken'] = str(start + PAGE_SIZE)
+        self._response = response
+        return self
+
+    def execute(self):
+        return self._response
+
+
+def _ids(comments):
+    return [c['item_id'] for c in comments]
+
+
+def test_capped_crawl_sets_watermark_and_next_run_reads_only_new_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(cy, 'FILTER_INDONESIAN', False)
+    state = VideoSyncState(str(tmp_path / 'state.json'))
+    service = StubService(350)
+
+    first = cy.fetch_comments_for_video(service, 'v1', 200, sync_state=state)
+    assert _ids(first) == [f'c{i}' for i in range(349, 149, -1)]
+    assert {call['order'] for call in service.calls} == {'time'}
+    assert state.get('v1')['newest_published_at'] is not None
+
+    service.add(30)
+    service.calls.clear()
+    second = cy.fetch_comments_for_video(service, 'v1', 200, sync_state=state)
+    assert _ids(second) == [f'c{i}' for i in range(379, 349, -1)]
+    assert len(service.calls) == 1
+
+
+def test_aborted_crawl_remembers_emitted_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(cy, 'FILTER_INDONESIAN', False)
+    state = VideoSyncState(str(tmp_path / 'state.json'))
+    service = StubService(250)
+
+    first = cy.fetch_comments_for_video(service, 'v1', 500, budget=QuotaBudget(1, path=None), sync_state=state)
+    assert len(first) == PAGE_SIZE
+    assert state.get('v1')['newest_published_at'] is None
+    assert state.is_due('v1')
+
+    second = cy.fetch_comments_for_video(service, 'v1', 500, sync_state=state)
+    assert not set(_ids(first)) & set(_ids(second))
+    assert len(first) + len(second) == 250